@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+自动驾驶模块
+以哈密顿回路为基础保证不死，在安全范围内用A*寻找通往食物的捷径
+
+安全规则: 蛇身始终按回路顺序排列（从蛇尾到蛇头），捷径只允许向回路前方跳跃，
+且跳跃后蛇头与蛇尾之间仍保留足够的空余格子，用于应对连续进食；
+蛇身超过棋盘一半后只沿回路行走。
+路径在食物变化时才重新计算，每次搜索受固定的节点扩展次数预算限制（由微秒预算按校准速率换算），
+超出则退回回路走法；预算与CPU负载无关，同一种子的对局总是走出相同的步子，实际耗时只用于统计。
+"""
+
+import heapq
+import time
+from array import array
+from game_core import Direction, OPPOSITE_DIRECTIONS
+
+DELTA_DIRECTIONS = {direction.value: direction for direction in Direction}
+
+# 每微秒可扩展的A*节点数（在 20x15 棋盘上对多局完整对局实测校准）
+EXPANSIONS_PER_US = 0.4
+
+def build_hamiltonian_cycle(grid_width, grid_height):
+    """构造哈密顿回路，返回按访问顺序排列的格子索引列表（宽高均为奇数时返回None）"""
+    if grid_height % 2 == 0 and grid_width >= 2:
+        # 蛇形遍历第1列之后的所有列，再沿第0列返回起点
+        cells = [(0, 0)]
+        for y in range(grid_height):
+            xs = range(1, grid_width) if y % 2 == 0 else range(grid_width - 1, 0, -1)
+            cells.extend((x, y) for x in xs)
+        cells.extend((0, y) for y in range(grid_height - 1, 0, -1))
+        return [y * grid_width + x for x, y in cells]
+    
+    if grid_width % 2 == 0 and grid_height >= 2:
+        # 转置后按上面的方式构造
+        transposed = build_hamiltonian_cycle(grid_height, grid_width)
+        return [(cell % grid_height) * grid_width + cell // grid_height for cell in transposed]
+    
+    return None
+
+class Autopilot:
+    """自动驾驶（哈密顿回路 + A*捷径，带每步搜索预算）"""
+    
+    def __init__(self, sim, budget_us=500, max_expansions=None):
+        """初始化自动驾驶
+        max_expansions 为每次A*搜索允许扩展的节点数，为None时由 budget_us 按 EXPANSIONS_PER_US 换算"""
+        self.sim = sim
+        self.budget_ns = int(budget_us * 1000)
+        if max_expansions is None:
+            max_expansions = max(1, int(budget_us * EXPANSIONS_PER_US))
+        self.max_expansions = max_expansions
+        self.grid_width = sim.grid_width
+        self.grid_height = sim.grid_height
+        self.cell_count = sim.grid_width * sim.grid_height
+        
+        # 回路顺序: cycle_order[格子] = 在回路中的序号，cycle_next[格子] = 回路中的下一个格子
+        cycle = build_hamiltonian_cycle(self.grid_width, self.grid_height)
+        self.has_cycle = cycle is not None
+        if self.has_cycle:
+            self.cycle_order = array('i', bytes(4 * self.cell_count))
+            self.cycle_next = array('i', bytes(4 * self.cell_count))
+            for order, cell in enumerate(cycle):
+                self.cycle_order[cell] = order
+                self.cycle_next[cell] = cycle[(order + 1) % self.cell_count]
+        
+        # 捷径安全余量（至少覆盖场上食物数量的连续进食）
+        self.shortcut_margin = sim.max_foods + 2
+        # 蛇身超过棋盘一半后停止走捷径：临近终局时空格几乎全是食物，
+        # 蛇会连续进食、蛇尾停止前进，必须保证此前留下的空洞已被蛇尾清空
+        self.shortcut_length_limit = self.cell_count // 2
+        
+        self.reset_stats()
+        self.reset()
+    
+    def reset(self):
+        """清空缓存的路径（新的一局开始时调用）"""
+        self.path = []
+        self.path_food_version = -1
+        self.last_tick = self.sim.tick_count
+    
+    def reset_stats(self):
+        """清空计时统计"""
+        self.decisions = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        self.over_budget = 0
+        self.path_searches = 0
+        self.aborted_searches = 0
+        self.shortcut_steps = 0
+    
+    def get_stats(self):
+        """获取计时统计"""
+        return {
+            "decisions": self.decisions,
+            "mean_us": round(self.total_ns / self.decisions / 1000, 3) if self.decisions else 0,
+            "max_us": round(self.max_ns / 1000, 3),
+            "budget_us": self.budget_ns / 1000,
+            "max_expansions": self.max_expansions,
+            "over_budget": self.over_budget,
+            "path_searches": self.path_searches,
+            "aborted_searches": self.aborted_searches,
+            "shortcut_steps": self.shortcut_steps
+        }
+    
+    def decide(self):
+        """计算下一步方向"""
+        start = time.perf_counter_ns()
+        if self.sim.tick_count < self.last_tick:
+            self.reset()
+        self.last_tick = self.sim.tick_count
+        
+        if self.has_cycle:
+            direction = self._decide_with_cycle()
+        else:
+            direction = self._fallback_direction(None)
+        
+        elapsed = time.perf_counter_ns() - start
+        self.decisions += 1
+        self.total_ns += elapsed
+        if elapsed > self.max_ns:
+            self.max_ns = elapsed
+        if elapsed > self.budget_ns:
+            self.over_budget += 1
+        return direction
+    
+    def _cell(self, pos):
+        return pos[1] * self.grid_width + pos[0]
+    
+    def _direction_to(self, head, cell):
+        """从蛇头移动到相邻格子的方向"""
+        dx = cell % self.grid_width - head % self.grid_width
+        dy = cell // self.grid_width - head // self.grid_width
+        return DELTA_DIRECTIONS.get((dx, dy))
+    
+    def _forward_distance(self, from_cell, to_cell):
+        """沿回路从 from_cell 前进到 to_cell 的步数"""
+        return (self.cycle_order[to_cell] - self.cycle_order[from_cell]) % self.cell_count
+    
+    def _decide_with_cycle(self):
+        """回路走法 + 捷径"""
+        sim = self.sim
+        head = self._cell(sim.snake[0])
+        tail = self._cell(sim.snake[-1])
+        tail_distance = self._forward_distance(head, tail) or self.cell_count
+        
+        # 食物变化或偏离路径时才重新寻路
+        if self.path_food_version != sim.food_version or (self.path and self._direction_to(head, self.path[-1]) is None):
+            self._plan_path(head, tail_distance)
+        
+        if self.path:
+            next_cell = self.path.pop()
+            if next_cell != self.cycle_next[head]:
+                self.shortcut_steps += 1
+        else:
+            next_cell = self.cycle_next[head]
+        
+        direction = self._direction_to(head, next_cell)
+        
+        # 长度为1时不能掉头；蛇身不符合回路顺序（例如中途开启）时先用安全策略过渡
+        next_pos = (next_cell % self.grid_width, next_cell // self.grid_width)
+        if direction == OPPOSITE_DIRECTIONS[sim.direction] or sim.check_collision(next_pos):
+            self.path = []
+            return self._fallback_direction(self.cycle_next[head])
+        return direction
+    
+    def _plan_path(self, head, tail_distance):
+        """为最近的回路前方食物规划A*捷径"""
+        self.path = []
+        self.path_food_version = self.sim.food_version
+        
+        limit = tail_distance - self.shortcut_margin
+        if limit <= 1 or len(self.sim.snake) >= self.shortcut_length_limit:
+            return
+        
+        # 选择沿回路最近且在安全范围内的食物
+        target = None
+        target_distance = limit + 1
+        for food_pos in self.sim.foods:
+            distance = self._forward_distance(head, self._cell(food_pos))
+            if 0 < distance < target_distance:
+                target = self._cell(food_pos)
+                target_distance = distance
+        if target is None:
+            return
+        
+        self.path_searches += 1
+        path = self._a_star(head, target, target_distance)
+        if path is None:
+            # 超出搜索预算：本步按回路走，下一步重试
+            self.aborted_searches += 1
+            self.path_food_version = -1
+            return
+        self.path = path
+    
+    def _a_star(self, head, target, target_distance):
+        """只允许沿回路向前的A*搜索，返回逆序路径（不含蛇头），超出扩展次数预算返回None"""
+        width = self.grid_width
+        height = self.grid_height
+        order = self.cycle_order
+        cell_count = self.cell_count
+        head_order = order[head]
+        target_x = target % width
+        target_y = target // width
+        
+        came_from = {head: None}
+        cost = {head: 0}
+        open_heap = [(abs(head % width - target_x) + abs(head // width - target_y), 0, head)]
+        max_expansions = self.max_expansions
+        expanded = 0
+        
+        while open_heap:
+            _, current_cost, current = heapq.heappop(open_heap)
+            if current == target:
+                break
+            if current_cost > cost[current]:
+                continue
+            
+            expanded += 1
+            if expanded > max_expansions:
+                return None
+            
+            current_progress = (order[current] - head_order) % cell_count
+            x = current % width
+            y = current // width
+            for nx, ny in ((x, y - 1), (x, y + 1), (x - 1, y), (x + 1, y)):
+                if nx < 0 or nx >= width or ny < 0 or ny >= height:
+                    continue
+                neighbor = ny * width + nx
+                progress = (order[neighbor] - head_order) % cell_count
+                # 只能向回路前方移动，且不越过目标食物
+                if progress <= current_progress or progress > target_distance:
+                    continue
+                new_cost = current_cost + 1
+                if new_cost < cost.get(neighbor, cell_count + 1):
+                    cost[neighbor] = new_cost
+                    came_from[neighbor] = current
+                    heuristic = abs(nx - target_x) + abs(ny - target_y)
+                    heapq.heappush(open_heap, (new_cost + heuristic, new_cost, neighbor))
+        
+        if target not in came_from:
+            return []
+        
+        path = []
+        cell = target
+        while cell != head:
+            path.append(cell)
+            cell = came_from[cell]
+        return path
+    
+    def _fallback_direction(self, preferred_cell):
+        """安全贪心：优先回路方向，否则选择离最近食物最近的安全方向"""
+        sim = self.sim
+        head_x, head_y = sim.snake[0]
+        candidates = []
+        for direction in Direction:
+            if direction == OPPOSITE_DIRECTIONS[sim.direction]:
+                continue
+            dx, dy = direction.value
+            pos = (head_x + dx, head_y + dy)
+            if sim.check_collision(pos):
+                continue
+            if preferred_cell is not None and self._cell(pos) == preferred_cell:
+                return direction
+            distance = min((abs(pos[0] - fx) + abs(pos[1] - fy) for fx, fy in sim.foods), default=0)
+            candidates.append((distance, direction))
+        
+        if not candidates:
+            return None
+        return min(candidates, key=lambda item: item[0])[1]
+
+# 锦标赛策略适配：每个进程按对局复用同一个自动驾驶实例
+_policy_autopilot = None
+
+def autopilot_policy(sim, rng):
+    """锦标赛策略接口 policy(sim, rng)"""
+    global _policy_autopilot
+    if _policy_autopilot is None or _policy_autopilot.sim is not sim:
+        _policy_autopilot = Autopilot(sim)
+    return _policy_autopilot.decide()
\ No newline at end of file
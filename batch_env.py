@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+批量环境模块
+基于NumPy同步推进N局独立的贪吃蛇游戏，规则与 SnakeSimulation 一致
+用于机器人训练与评估（需要安装 numpy）
+"""
+
+import numpy as np
+from game_core import CELL_EMPTY, CELL_BODY, CELL_HEAD, CELL_FOOD
+
+# 动作编号与 Direction 枚举顺序一致：上、下、左、右
+ACTION_DELTAS = np.array([(0, -1), (0, 1), (-1, 0), (1, 0)], dtype=np.int64)
+OPPOSITE_ACTIONS = np.array([1, 0, 3, 2], dtype=np.int64)
+ACTION_RIGHT = 3
+
+class BatchSnakeEnv:
+    """批量贪吃蛇环境（所有局面以数组存储，每个tick一次向量化步进）"""
+    
+    def __init__(self, num_envs, grid_width=20, grid_height=15, seed=None, max_ticks=None):
+        """初始化批量环境"""
+        self.num_envs = num_envs
+        self.grid_width = grid_width
+        self.grid_height = grid_height
+        self.cell_count = grid_width * grid_height
+        self.max_ticks = max_ticks
+        
+        # 规则参数（与 SnakeSimulation 保持一致）
+        self.max_foods = 20
+        self.victory_length = min(300, self.cell_count)
+        self.food_score = 10
+        
+        self.rng = np.random.default_rng(seed)
+        self.env_ids = np.arange(num_envs)
+        
+        # 占用网格：每局一行，格子类型与 game_core 相同
+        self.grid = np.zeros((num_envs, self.cell_count), dtype=np.uint8)
+        # 蛇身环形缓冲区（存放格子索引），head_ptr 指向蛇头
+        self.body = np.zeros((num_envs, self.cell_count), dtype=np.int32)
+        self.head_ptr = np.zeros(num_envs, dtype=np.int64)
+        self.length = np.zeros(num_envs, dtype=np.int64)
+        self.direction = np.zeros(num_envs, dtype=np.int64)
+        self.food_count = np.zeros(num_envs, dtype=np.int64)
+        self.score = np.zeros(num_envs, dtype=np.int64)
+        self.ticks = np.zeros(num_envs, dtype=np.int64)
+        
+        self.reset()
+    
+    def observation(self):
+        """返回占用网格的零拷贝视图，形状为 (N, 高, 宽)"""
+        return self.grid.reshape(self.num_envs, self.grid_height, self.grid_width)
+    
+    def reset(self, env_ids=None):
+        """重置指定的局（默认全部），返回观测"""
+        if env_ids is None:
+            env_ids = self.env_ids
+        if len(env_ids) == 0:
+            return self.observation()
+        
+        start = (self.grid_height // 2) * self.grid_width + self.grid_width // 2
+        self.grid[env_ids] = CELL_EMPTY
+        self.grid[env_ids, start] = CELL_HEAD
+        self.body[env_ids, 0] = start
+        self.head_ptr[env_ids] = 0
+        self.length[env_ids] = 1
+        self.direction[env_ids] = ACTION_RIGHT
+        self.food_count[env_ids] = 0
+        self.score[env_ids] = 0
+        self.ticks[env_ids] = 0
+        
+        # 初始食物（3-5个）
+        self._spawn_foods(env_ids, self.rng.integers(3, 6, size=len(env_ids)))
+        return self.observation()
+    
+    def _spawn_foods(self, env_ids, counts):
+        """为指定的局各生成若干食物，棋盘已满时提前停止"""
+        env_ids = np.asarray(env_ids)
+        counts = np.asarray(counts, dtype=np.int64).copy()
+        
+        # 先做几轮向量化拒绝采样，低占用率时几乎一次完成
+        for _ in range(8):
+            pending = counts > 0
+            if not pending.any():
+                return
+            ids = env_ids[pending]
+            cells = self.rng.integers(0, self.cell_count, size=len(ids))
+            free = self.grid[ids, cells] == CELL_EMPTY
+            # 同一局在一轮中只放置一个食物，避免重复选中同一格
+            self.grid[ids[free], cells[free]] = CELL_FOOD
+            self.food_count[ids[free]] += 1
+            counts[np.flatnonzero(pending)[free]] -= 1
+        
+        # 高占用率时直接在空闲格子中随机选取（随机键取最大值）
+        while True:
+            pending = np.flatnonzero(counts > 0)
+            if len(pending) == 0:
+                return
+            ids = env_ids[pending]
+            keys = self.rng.random((len(ids), self.cell_count))
+            keys[self.grid[ids] != CELL_EMPTY] = -1.0
+            cells = keys.argmax(axis=1)
+            has_free = keys[np.arange(len(ids)), cells] >= 0.0
+            self.grid[ids[has_free], cells[has_free]] = CELL_FOOD
+            self.food_count[ids[has_free]] += 1
+            counts[pending[has_free]] -= 1
+            counts[pending[~has_free]] = 0
+    
+    def step(self, actions):
+        """推进所有局一个逻辑步
+        
+        actions 为长度N的整数数组（0上 1下 2左 3右，-1保持当前方向），
+        返回 (观测, 奖励, 结束标记, 信息)。结束的局会被自动重置，
+        信息中的 final_* 数组记录其重置前的结果。
+        """
+        actions = np.asarray(actions, dtype=np.int64)
+        ids = self.env_ids
+        width = self.grid_width
+        
+        # 更新方向（禁止直接掉头）
+        valid = (actions >= 0) & (actions != OPPOSITE_ACTIONS[self.direction])
+        self.direction = np.where(valid, actions, self.direction)
+        
+        # 计算新蛇头
+        old_head = self.body[ids, self.head_ptr].astype(np.int64)
+        deltas = ACTION_DELTAS[self.direction]
+        new_x = old_head % width + deltas[:, 0]
+        new_y = old_head // width + deltas[:, 1]
+        
+        # 碰撞检测：边界与自身（撞到当前蛇尾同样判定为碰撞）
+        hit_wall = (new_x < 0) | (new_x >= width) | (new_y < 0) | (new_y >= self.grid_height)
+        new_head = np.where(hit_wall, 0, new_y * width + new_x)
+        target = self.grid[ids, new_head]
+        hit_self = ~hit_wall & ((target == CELL_BODY) | (target == CELL_HEAD))
+        dead = hit_wall | hit_self
+        alive = ~dead
+        eaten = alive & (target == CELL_FOOD)
+        
+        # 记录移动前的蛇尾
+        tail_ptr = (self.head_ptr - self.length + 1) % self.cell_count
+        old_tail = self.body[ids, tail_ptr]
+        
+        # 移动蛇
+        moving = ids[alive]
+        self.grid[moving, old_head[alive]] = CELL_BODY
+        self.grid[moving, new_head[alive]] = CELL_HEAD
+        self.head_ptr[alive] = (self.head_ptr[alive] + 1) % self.cell_count
+        self.body[moving, self.head_ptr[alive]] = new_head[alive]
+        
+        # 没吃到食物的局移除尾部
+        shrinking = alive & ~eaten
+        self.grid[ids[shrinking], old_tail[shrinking]] = CELL_EMPTY
+        
+        # 吃到食物：加分、增长并补充食物
+        self.length += eaten
+        self.score += eaten * self.food_score
+        self.food_count -= eaten
+        self.ticks += alive
+        
+        eaters = np.flatnonzero(eaten)
+        if len(eaters):
+            target_count = np.minimum(self.max_foods, np.maximum(5, self.length[eaters] // 10 + 3))
+            self._spawn_foods(eaters, target_count - self.food_count[eaters])
+        
+        victory = eaten & (self.length >= self.victory_length)
+        truncated = np.zeros(self.num_envs, dtype=bool)
+        if self.max_ticks is not None:
+            truncated = alive & ~victory & (self.ticks >= self.max_ticks)
+        dones = dead | victory | truncated
+        
+        rewards = (eaten * self.food_score).astype(np.float32)
+        info = {
+            "victory": victory,
+            "hit_wall": hit_wall,
+            "hit_self": hit_self,
+            "truncated": truncated,
+            "final_score": np.where(dones, self.score, 0),
+            "final_length": np.where(dones, self.length, 0),
+            "final_ticks": np.where(dones, self.ticks, 0)
+        }
+        
+        # 自动重置结束的局
+        self.reset(np.flatnonzero(dones))
+        
+        return self.observation(), rewards, dones, info
\ No newline at end of file
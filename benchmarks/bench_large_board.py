@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+大棋盘压力基准
+在1000x1000棋盘上摆放1千/1万/10万节的蛇，测量每步模拟耗时与每节内存占用
+
+用法:
+    python benchmarks/bench_large_board.py
+    python benchmarks/bench_large_board.py --lengths 1000 100000 --ticks 500 --output large_board.json
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game_core import Direction, GameState, SnakeSimulation
+from stats_util import percentile
+
+def serpentine_snake(length, grid_width):
+    """生成逐行往返排列的蛇身（从蛇头到蛇尾），蛇头下方为空行"""
+    positions = []
+    for i in range(length):
+        y = i // grid_width
+        x = i % grid_width if y % 2 == 0 else grid_width - 1 - i % grid_width
+        positions.append((x, y))
+    positions.reverse()
+    return positions
+
+def bench_length(sim, length, ticks):
+    """摆放指定长度的蛇并测量向下直行时的每步耗时"""
+    sim.reset(length)
+    sim.set_snake(serpentine_snake(length, sim.grid_width), Direction.DOWN)
+    
+    head_y = sim.snake[0][1]
+    ticks = min(ticks, sim.grid_height - head_y - 1)
+    samples = []
+    for _ in range(ticks):
+        start = time.perf_counter_ns()
+        state, _ = sim.step()
+        samples.append(time.perf_counter_ns() - start)
+        if state != GameState.PLAYING:
+            break
+    
+    samples.sort()
+    return {
+        "length": length,
+        "ticks": len(samples),
+        "final_length": len(sim.snake),
+        "mean_us": round(sum(samples) / len(samples) / 1000, 3),
+        "p50_us": round(percentile(samples, 0.50) / 1000, 3),
+        "p99_us": round(percentile(samples, 0.99) / 1000, 3),
+        "max_us": round(samples[-1] / 1000, 3),
+        "body_bytes_per_segment": sim.snake.cells.itemsize
+    }
+
+def main():
+    """命令行入口"""
+    parser = argparse.ArgumentParser(description="大棋盘压力基准")
+    parser.add_argument("--width", type=int, default=1000, help="棋盘宽度")
+    parser.add_argument("--height", type=int, default=1000, help="棋盘高度")
+    parser.add_argument("--lengths", type=int, nargs="+", default=[1000, 10000, 100000],
+                        help="要测试的蛇长度")
+    parser.add_argument("--ticks", type=int, default=500, help="每个长度测量的步数")
+    parser.add_argument("--output", help="结果输出文件（JSON）")
+    args = parser.parse_args()
+    
+    start = time.perf_counter()
+    sim = SnakeSimulation(args.width, args.height, seed=0, victory_length=args.width * args.height)
+    setup_seconds = time.perf_counter() - start
+    
+    results = []
+    for length in args.lengths:
+        result = bench_length(sim, length, args.ticks)
+        results.append(result)
+        print(f"长度 {result['length']:>7}: 平均 {result['mean_us']:.2f}us, p50 {result['p50_us']:.2f}us, "
+              f"p99 {result['p99_us']:.2f}us, 最大 {result['max_us']:.2f}us ({result['ticks']} 步)")
+    
+    report = {
+        "grid": [args.width, args.height],
+        "setup_seconds": round(setup_seconds, 3),
+        "results": results
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"结果已写入: {args.output}")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
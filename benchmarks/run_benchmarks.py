@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+基准测试套件
+使用SDL虚拟显示驱动无窗口运行，覆盖模拟、渲染与存档的热点路径，结果输出为JSON便于对比
+
+用法:
+    python benchmarks/run_benchmarks.py
+    python benchmarks/run_benchmarks.py --quick --output before.json
+    python benchmarks/run_benchmarks.py --only update draw
+    python benchmarks/run_benchmarks.py --compare before.json after.json
+"""
+
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import argparse
+import json
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+import pygame
+from bench_large_board import serpentine_snake
+from config_store import close_config_stores
+from font_service import FontService, get_chinese_font
+from game_clock import ManualClock
+from game_core import Direction
+from game_logic import SnakeGame
+from score_manager import ScoreManager
+from skin_manager import SkinManager
+from text_cache import text_cache
+from stats_util import percentile
+from ui_menu import MainMenu
+
+SCREEN_SIZE = (800, 600)
+
+def measure(func, repeat):
+    """重复调用 func 并统计耗时（微秒）"""
+    repeat = max(1, int(repeat))
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter_ns()
+        func()
+        samples.append(time.perf_counter_ns() - start)
+    
+    samples.sort()
+    return {
+        "repeat": repeat,
+        "mean_us": round(sum(samples) / len(samples) / 1000, 3),
+        "p50_us": round(percentile(samples, 0.50) / 1000, 3),
+        "p95_us": round(percentile(samples, 0.95) / 1000, 3),
+        "max_us": round(samples[-1] / 1000, 3)
+    }
+
+def make_game(screen, grid_width=20, grid_height=15, victory_length=300):
+    """创建使用手动时钟的游戏实例"""
+    return SnakeGame(screen, SkinManager(), ScoreManager(), clock=ManualClock(), seed=0,
+                     grid_width=grid_width, grid_height=grid_height, victory_length=victory_length)
+
+def bench_update(screen, scale):
+    """SnakeGame.update() 在不同蛇长下的每秒步数（100x100棋盘，蛇向下直行）"""
+    results = {}
+    for length in (10, 100, 1000, 5000):
+        game = make_game(screen, 100, 100, victory_length=10000)
+        game.playback = True  # 不录制输入、不写存档，只测模拟与调度
+        
+        def place_snake():
+            game.core.reset(length)
+            game.core.set_snake(serpentine_snake(length, game.grid_width), Direction.DOWN)
+        
+        place_snake()
+        ticks = 0
+        elapsed = 0
+        while ticks < 2000 * scale:
+            if game.snake[0][1] >= game.grid_height - 1:
+                place_snake()
+            game.clock.advance(game.base_move_delay)
+            start = time.perf_counter_ns()
+            game.update()
+            elapsed += time.perf_counter_ns() - start
+            ticks += 1
+        
+        results[str(length)] = {
+            "ticks": ticks,
+            "ticks_per_second": round(ticks / (elapsed / 1e9), 1),
+            "mean_us": round(elapsed / ticks / 1000, 3)
+        }
+    return results
+
+def bench_generate_food(screen, scale):
+    """generate_food() 在高填充率棋盘上的耗时（20x15棋盘）"""
+    results = {}
+    for fill in (0.5, 0.9, 0.99):
+        game = make_game(screen)
+        core = game.core
+        length = int(core.cell_count * fill)
+        core.set_snake(serpentine_snake(length, core.grid_width), Direction.DOWN)
+        results[f"{fill:.2f}"] = measure(core.generate_food, 2000 * scale)
+    return results
+
+def bench_draw(screen, scale):
+    """SnakeGame.draw() 与 MainMenu.draw() 的每帧耗时"""
+    results = {}
+    for length in (1, 150):
+        game = make_game(screen)
+        game.core.set_snake(serpentine_snake(length, game.grid_width), Direction.DOWN)
+        game.invalidate_board()
+        results[f"game_length_{length}"] = measure(game.draw, 200 * scale)
+    
+    # 棋盘图层整体重绘（开局、换皮肤时的一次性开销）
+    def rebuild_board():
+        game.invalidate_board()
+        game.draw_board()
+    
+    results["board_rebuild_length_150"] = measure(rebuild_board, 200 * scale)
+    
+    menu = MainMenu(screen, SkinManager(), ScoreManager())
+    results["main_menu"] = measure(menu.draw, 200 * scale)
+    results["text_cache"] = text_cache.get_stats()
+    return results
+
+def bench_font(screen, scale):
+    """字体解析耗时：首次解析（遍历系统字体）、读取磁盘缓存后解析、共享字体的获取"""
+    cache_file = os.path.abspath("font_cache_bench.json")
+    
+    def resolve_cold():
+        if os.path.exists(cache_file):
+            os.remove(cache_file)
+        FontService(cache_file).get_font(24)
+    
+    def resolve_cached():
+        FontService(cache_file).get_font(24)
+    
+    results = {"resolve_cold": measure(resolve_cold, 5 * scale)}
+    resolve_cached()  # 确保缓存文件存在
+    results["resolve_cached"] = measure(resolve_cached, 20 * scale)
+    results["shared_size_24"] = measure(lambda: get_chinese_font(24), 200 * scale)
+    return results
+
+def bench_save(screen, scale):
+    """ScoreManager.update_high_score() 的存档延迟（游戏线程上）与后台线程实际写盘的耗时"""
+    score_manager = ScoreManager()
+    scores = iter(range(10, 10 ** 9, 10))
+    results = {
+        "update_high_score": measure(lambda: score_manager.update_high_score(next(scores)), 50 * scale)
+    }
+    
+    def flush():
+        score_manager.config_store.update(last_updated=time.time())
+        score_manager.config_store.flush()
+    
+    results["background_flush"] = measure(flush, 20 * scale)
+    
+    # 不限条数、已有10万局历史时每局的追加开销
+    unlimited = ScoreManager(history_limit=None, log_file="scores_unlimited.jsonl")
+    unlimited.score_history = [{'score': i, 'timestamp': f"{i:020d}", 'is_record': False} for i in range(100000)]
+    unlimited.stats.rebuild(unlimited.score_history)
+    unlimited.save_scores()
+    results["update_high_score_history_100k"] = measure(lambda: unlimited.update_high_score(next(scores)), 50 * scale)
+    
+    # 菜单每帧调用的统计查询（增量统计，不扫描历史记录）
+    def query_statistics():
+        unlimited.get_statistics()
+        unlimited.get_score_rank(50000)
+        unlimited.get_percentile(0.9)
+    
+    results["statistics_queries_history_100k"] = measure(query_statistics, 200 * scale)
+    unlimited.close()
+    score_manager.close()
+    return results
+
+BENCHMARKS = {
+    "update": bench_update,
+    "generate_food": bench_generate_food,
+    "draw": bench_draw,
+    "font": bench_font,
+    "save": bench_save
+}
+
+def run_benchmarks(names, scale=1):
+    """在临时目录中运行指定的基准（不读写仓库中的 config.json）"""
+    work_dir = tempfile.mkdtemp(prefix="snake_bench_")
+    previous_dir = os.getcwd()
+    os.chdir(work_dir)
+    pygame.init()
+    try:
+        screen = pygame.display.set_mode(SCREEN_SIZE)
+        results = {}
+        for name in names:
+            start = time.perf_counter()
+            results[name] = BENCHMARKS[name](screen, scale)
+            print(f"{name}: 完成 ({time.perf_counter() - start:.2f}s)", file=sys.stderr)
+        return results
+    finally:
+        close_config_stores()  # 在删除临时目录前写出配置
+        pygame.quit()
+        os.chdir(previous_dir)
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+def _flatten(results, prefix=""):
+    """将嵌套结果展开为 {路径: 数值}"""
+    flat = {}
+    for key, value in results.items():
+        path = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(_flatten(value, path + "."))
+        elif isinstance(value, (int, float)) and not path.endswith(("repeat", "ticks")):
+            flat[path] = value
+    return flat
+
+def compare(before_file, after_file):
+    """对比两次运行的结果并打印变化百分比"""
+    with open(before_file, 'r', encoding='utf-8') as f:
+        before = _flatten(json.load(f)["results"])
+    with open(after_file, 'r', encoding='utf-8') as f:
+        after = _flatten(json.load(f)["results"])
+    
+    for path in sorted(before.keys() & after.keys()):
+        old, new = before[path], after[path]
+        change = (new - old) / old * 100 if old else 0
+        print(f"{path:<45} {old:>14.3f} -> {new:>14.3f} ({change:+.1f}%)")
+
+def main():
+    """命令行入口"""
+    parser = argparse.ArgumentParser(description="贪吃蛇基准测试套件（无窗口运行）")
+    parser.add_argument("--only", nargs="+", choices=list(BENCHMARKS), help="只运行指定的基准")
+    parser.add_argument("--quick", action="store_true", help="减少重复次数，快速检查")
+    parser.add_argument("--output", default="benchmark_results.json", help="结果输出文件（JSON）")
+    parser.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"), help="对比两份结果文件")
+    args = parser.parse_args()
+    
+    if args.compare:
+        compare(*args.compare)
+        return
+    
+    output = os.path.abspath(args.output)
+    names = args.only or list(BENCHMARKS)
+    results = run_benchmarks(names, scale=0.25 if args.quick else 1)
+    
+    report = {
+        "timestamp": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "platform": platform.platform(),
+        "video_driver": os.environ.get("SDL_VIDEODRIVER"),
+        "results": results
+    }
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    
+    print(json.dumps(results, ensure_ascii=False, indent=2))
+    print(f"结果已写入: {output}")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
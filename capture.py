@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+性能采集模块
+按需在指定秒数内同时运行 cProfile 与 tracemalloc，结束后在 config.json 所在目录写出
+.pstats 文件与内存分配排行报告（源码运行与打包后的exe行为一致）
+
+启动方式: 游戏中按F5，或设置环境变量 SNAKE_PROFILE_CAPTURE=秒数 在启动时开始采集
+"""
+
+import cProfile
+import os
+import time
+import tracemalloc
+from datetime import datetime
+
+CAPTURE_ENV_VAR = "SNAKE_PROFILE_CAPTURE"
+DEFAULT_CAPTURE_SECONDS = 10
+
+def capture_seconds_from_env():
+    """读取环境变量中的采集秒数，未设置或无效时返回None"""
+    value = os.environ.get(CAPTURE_ENV_VAR, "").strip()
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        # 设置为非数字（例如 "on"）时使用默认时长
+        return DEFAULT_CAPTURE_SECONDS
+    return seconds if seconds > 0 else None
+
+class ProfileCapture:
+    """cProfile + tracemalloc 定时采集"""
+    
+    def __init__(self, config_file="config.json", top_count=30, traceback_depth=10):
+        """初始化采集器（输出目录为 config_file 所在目录）"""
+        self.output_dir = os.path.dirname(os.path.abspath(config_file))
+        self.top_count = top_count
+        self.traceback_depth = traceback_depth
+        self.active = False
+        self.profile = None
+        self.end_time = 0
+        self.start_snapshot = None
+        self._started_tracemalloc = False
+    
+    def start(self, seconds=DEFAULT_CAPTURE_SECONDS):
+        """开始采集"""
+        if self.active:
+            return
+        
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.traceback_depth)
+            self._started_tracemalloc = True
+        self.start_snapshot = tracemalloc.take_snapshot()
+        
+        self.duration = seconds
+        self.started_at = time.perf_counter()
+        self.end_time = self.started_at + seconds
+        self.profile = cProfile.Profile()
+        self.profile.enable()
+        self.active = True
+        print(f"性能采集已开始（{seconds:g}秒）")
+    
+    def toggle(self, seconds=DEFAULT_CAPTURE_SECONDS):
+        """开始采集，采集中则提前结束"""
+        if self.active:
+            return self.stop()
+        self.start(seconds)
+        return None
+    
+    def poll(self):
+        """每帧调用：到时则结束采集并返回写出的文件列表"""
+        if self.active and time.perf_counter() >= self.end_time:
+            return self.stop()
+        return None
+    
+    def stop(self):
+        """结束采集并写出报告，返回文件名列表"""
+        if not self.active:
+            return None
+        self.profile.disable()
+        self.active = False
+        elapsed = time.perf_counter() - self.started_at
+        
+        end_snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+        
+        base = os.path.join(self.output_dir, f"profile_capture_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}")
+        stats_file = base + ".pstats"
+        report_file = base + "_allocations.txt"
+        try:
+            os.makedirs(self.output_dir, exist_ok=True)
+            self.profile.dump_stats(stats_file)
+            self._write_allocation_report(report_file, end_snapshot, elapsed, current, peak)
+        except Exception as e:
+            print(f"保存性能采集结果失败: {e}")
+            return None
+        finally:
+            self.profile = None
+            self.start_snapshot = None
+        
+        print(f"性能采集已保存: {stats_file}, {report_file}")
+        return [stats_file, report_file]
+    
+    def _write_allocation_report(self, filename, end_snapshot, elapsed, current, peak):
+        """写出内存分配排行报告"""
+        filters = [
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<unknown>")
+        ]
+        end_snapshot = end_snapshot.filter_traces(filters)
+        start_snapshot = self.start_snapshot.filter_traces(filters)
+        
+        lines = [
+            f"采集时长: {elapsed:.2f} 秒",
+            f"当前跟踪内存: {current / 1024:.1f} KiB, 峰值: {peak / 1024:.1f} KiB",
+            "",
+            f"== 采集期间新增分配 Top {self.top_count}（按代码行） =="
+        ]
+        for stat in end_snapshot.compare_to(start_snapshot, "lineno")[:self.top_count]:
+            lines.append(str(stat))
+        
+        lines += ["", f"== 采集结束时存活分配 Top {self.top_count}（按代码行） =="]
+        for stat in end_snapshot.statistics("lineno")[:self.top_count]:
+            lines.append(str(stat))
+        
+        lines += ["", "== 最大分配的调用栈 =="]
+        for stat in end_snapshot.statistics("traceback")[:3]:
+            lines.append(f"{stat.count} 个内存块, {stat.size / 1024:.1f} KiB")
+            lines.extend(stat.traceback.format())
+        
+        with open(filename, 'w', encoding='utf-8') as f:
+            f.write("\n".join(lines) + "\n")
\ No newline at end of file
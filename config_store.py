@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+配置存储模块
+皮肤与分数管理器共享同一份内存中的 config.json 文档；修改只更新内存并唤醒后台写盘线程，
+写盘经过防抖合并，并通过 临时文件 + fsync + 重命名 原子替换，游戏线程不会等待磁盘
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+
+class ConfigStore:
+    """共享配置文档（防抖的后台原子写盘）"""
+    
+    def __init__(self, config_file="config.json", debounce=0.5):
+        """初始化并读取配置文件（debounce 为最后一次修改后等待写盘的秒数）"""
+        self.config_file = os.path.abspath(config_file)
+        self.debounce = debounce
+        self.data = {}
+        self.loaded = False
+        self.write_count = 0
+        
+        self._cond = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._dirty = False
+        self._deadline = 0
+        self._closed = False
+        self._thread = None
+        
+        self.load()
+    
+    def load(self):
+        """从磁盘读取配置（文件不存在或损坏时使用空文档）"""
+        data = {}
+        loaded = False
+        try:
+            if os.path.exists(self.config_file):
+                with open(self.config_file, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                loaded = isinstance(data, dict)
+                if not loaded:
+                    data = {}
+        except Exception as e:
+            print(f"加载配置文件失败: {e}")
+        
+        with self._cond:
+            self.data = data
+            self.loaded = loaded
+            self._dirty = False
+        return loaded
+    
+    def get(self, key, default=None):
+        """读取配置项"""
+        with self._cond:
+            return self.data.get(key, default)
+    
+    def update(self, values=None, **kwargs):
+        """修改若干配置项并安排后台写盘"""
+        with self._cond:
+            if values:
+                self.data.update(values)
+            self.data.update(kwargs)
+            self._schedule()
+    
+    def remove(self, *keys):
+        """删除配置项并安排后台写盘"""
+        with self._cond:
+            removed = [key for key in keys if self.data.pop(key, None) is not None]
+            if removed:
+                self._schedule()
+    
+    def setdefault(self, key, value):
+        """配置项不存在时写入默认值，返回当前值"""
+        with self._cond:
+            if key in self.data:
+                return self.data[key]
+            self.data[key] = value
+            self._schedule()
+            return value
+    
+    def _schedule(self):
+        """标记有待写入的修改（调用方需持有锁）"""
+        self._dirty = True
+        self._deadline = time.monotonic() + self.debounce
+        if self._thread is None and not self._closed:
+            self._thread = threading.Thread(target=self._writer_loop, name="config-writer", daemon=True)
+            self._thread.start()
+        self._cond.notify()
+    
+    def _writer_loop(self):
+        """后台写盘线程：最后一次修改后 debounce 秒内没有新修改才写出"""
+        while True:
+            with self._cond:
+                while not self._dirty and not self._closed:
+                    self._cond.wait()
+                if not self._dirty:
+                    return
+                while not self._closed:
+                    remaining = self._deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+            self._write_pending()
+    
+    def _write_pending(self):
+        """把当前文档写盘（没有待写入的修改时直接返回）"""
+        with self._write_lock:
+            with self._cond:
+                if not self._dirty:
+                    return False
+                text = json.dumps(self.data, ensure_ascii=False, indent=2)
+                self._dirty = False
+            return self._atomic_write(text)
+    
+    def _atomic_write(self, text):
+        """写入临时文件并 fsync 后重命名替换，中途崩溃也不会留下半个文件"""
+        temp_file = self.config_file + ".tmp"
+        try:
+            directory = os.path.dirname(self.config_file)
+            os.makedirs(directory, exist_ok=True)
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                f.write(text)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_file, self.config_file)
+            self.write_count += 1
+            return True
+        except Exception as e:
+            print(f"保存配置文件失败: {e}")
+            return False
+    
+    def flush(self):
+        """立即同步写出未保存的修改"""
+        return self._write_pending()
+    
+    def close(self):
+        """停止后台线程并写出未保存的修改（退出前调用）"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout=5)
+        self.flush()
+
+# 同一个配置文件在进程内共享一个存储
+_stores = {}
+_stores_lock = threading.Lock()
+
+def get_config_store(config_file="config.json"):
+    """获取配置文件对应的共享存储"""
+    path = os.path.abspath(config_file)
+    with _stores_lock:
+        store = _stores.get(path)
+        if store is None:
+            store = ConfigStore(path)
+            _stores[path] = store
+        return store
+
+def close_config_stores():
+    """关闭所有共享存储并写出未保存的修改"""
+    with _stores_lock:
+        stores = list(_stores.values())
+        _stores.clear()
+    for store in stores:
+        store.close()
+
+atexit.register(close_config_stores)
\ No newline at end of file
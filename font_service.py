@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+字体服务模块
+统一解析支持中文的系统字体，并把解析出的字体文件路径缓存到磁盘；
+之后启动时直接用 pygame.font.Font(路径, 字号) 打开，同一字号的字体对象全局共享
+"""
+
+import json
+import os
+import pygame
+
+# 候选字体，按优先级排序
+FONT_NAMES = [
+    'Microsoft YaHei',  # 微软雅黑
+    'SimHei',           # 黑体
+    'SimSun',           # 宋体
+    'KaiTi',            # 楷体
+    'FangSong',         # 仿宋
+    'Arial Unicode MS', # Arial Unicode
+    'DejaVu Sans',      # Linux常用字体
+    'Noto Sans CJK SC'  # Google Noto字体
+]
+
+class FontService:
+    """中文字体解析与共享服务"""
+    
+    def __init__(self, cache_file="font_cache.json"):
+        """初始化字体服务"""
+        self.cache_file = cache_file
+        self.font_path = None
+        self.resolved = False
+        self.fonts = {}
+    
+    def _load_cached_path(self):
+        """读取缓存的字体路径，返回 (是否命中, 路径)"""
+        try:
+            if os.path.exists(self.cache_file):
+                with open(self.cache_file, 'r', encoding='utf-8') as f:
+                    cache = json.load(f)
+                # 候选列表变化、字体文件已不存在或上次未找到字体（之后可能已安装）时重新解析
+                if cache.get('font_names') != FONT_NAMES:
+                    return False, None
+                path = cache.get('font_path')
+                if path is not None and os.path.exists(path):
+                    return True, path
+        except Exception as e:
+            print(f"读取字体缓存失败: {e}")
+        return False, None
+    
+    def _save_cached_path(self, path):
+        """保存解析出的字体路径"""
+        try:
+            with open(self.cache_file, 'w', encoding='utf-8') as f:
+                json.dump({'font_path': path, 'font_names': FONT_NAMES}, f, ensure_ascii=False, indent=2)
+        except Exception as e:
+            print(f"保存字体缓存失败: {e}")
+    
+    def _find_font_path(self):
+        """遍历系统字体，返回第一个可用的候选字体文件路径"""
+        for font_name in FONT_NAMES:
+            try:
+                path = pygame.font.match_font(font_name)
+                if not path:
+                    continue
+                # 测试字体是否支持中文
+                test_surface = pygame.font.Font(path, 24).render('测试', True, (255, 255, 255))
+                if test_surface.get_width() > 0:
+                    return path
+            except Exception:
+                continue
+        return None
+    
+    def resolve_font_path(self):
+        """解析字体文件路径（优先使用磁盘缓存，None 表示使用pygame默认字体）"""
+        if self.resolved:
+            return self.font_path
+        
+        hit, path = self._load_cached_path()
+        if not hit:
+            path = self._find_font_path()
+            self._save_cached_path(path)
+        
+        self.font_path = path
+        self.resolved = True
+        return path
+    
+    def get_font(self, size):
+        """获取指定字号的字体（同一字号共享同一个对象）"""
+        font = self.fonts.get(size)
+        if font is None:
+            path = self.resolve_font_path()
+            try:
+                font = pygame.font.Font(path, size)
+            except Exception as e:
+                print(f"加载字体失败: {e}")
+                font = pygame.font.Font(None, size)
+            self.fonts[size] = font
+        return font
+    
+    def clear(self):
+        """丢弃已创建的字体对象（pygame.font 重新初始化后调用）"""
+        self.fonts.clear()
+
+# 进程内共享的字体服务
+font_service = FontService()
+
+def get_chinese_font(size):
+    """获取支持中文的字体"""
+    return font_service.get_font(size)
\ No newline at end of file
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+食物生成模块
+维护空闲格子索引，支持多种食物生成策略，棋盘占满时安全返回
+"""
+
+from array import array
+
+class FreeCellIndex:
+    """空闲格子索引：O(1) 随机选取、插入与删除"""
+    
+    def __init__(self, cell_count):
+        """初始化索引（所有格子均为空闲）"""
+        self.cell_count = cell_count
+        self.reset()
+    
+    def reset(self):
+        """将所有格子标记为空闲"""
+        # cells 为紧凑存放的空闲格子，positions 记录每个格子在 cells 中的下标（-1表示已占用）
+        self.cells = array('i', range(self.cell_count))
+        self.positions = array('i', range(self.cell_count))
+    
+    def __len__(self):
+        return len(self.cells)
+    
+    def __contains__(self, cell):
+        return self.positions[cell] >= 0
+    
+    def add(self, cell):
+        """将格子标记为空闲"""
+        if self.positions[cell] >= 0:
+            return
+        self.positions[cell] = len(self.cells)
+        self.cells.append(cell)
+    
+    def remove(self, cell):
+        """将格子标记为占用（与末尾元素交换后弹出）"""
+        position = self.positions[cell]
+        if position < 0:
+            return
+        last_cell = self.cells.pop()
+        if last_cell != cell:
+            self.cells[position] = last_cell
+            self.positions[last_cell] = position
+        self.positions[cell] = -1
+    
+    def random_cell(self, rng):
+        """随机选取一个空闲格子，没有空闲格子时返回None"""
+        if not self.cells:
+            return None
+        return self.cells[rng.randrange(len(self.cells))]
+
+class FoodSpawner:
+    """食物生成器（基于空闲格子索引）"""
+    
+    # 可用的生成策略
+    STRATEGIES = ("uniform", "away_from_head", "cluster")
+    
+    def __init__(self, grid_width, grid_height, strategy="uniform"):
+        """初始化食物生成器"""
+        if strategy not in self.STRATEGIES:
+            raise ValueError(f"未知的食物生成策略: {strategy}")
+        
+        self.grid_width = grid_width
+        self.grid_height = grid_height
+        self.strategy = strategy
+        self.free_cells = FreeCellIndex(grid_width * grid_height)
+        
+        # 远离蛇头策略的候选采样数
+        self.away_samples = 8
+        # 聚集策略的邻域半径与尝试次数
+        self.cluster_radius = 2
+        self.cluster_attempts = 6
+    
+    def reset(self):
+        """重置空闲格子索引"""
+        self.free_cells.reset()
+    
+    def pick(self, rng, head=None, foods=()):
+        """按当前策略选取一个食物位置，棋盘已满时返回None"""
+        if not self.free_cells:
+            return None
+        
+        if self.strategy == "away_from_head" and head is not None:
+            cell = self._pick_away_from_head(rng, head)
+        elif self.strategy == "cluster" and foods:
+            cell = self._pick_cluster(rng, foods)
+        else:
+            cell = self.free_cells.random_cell(rng)
+        
+        return (cell % self.grid_width, cell // self.grid_width)
+    
+    def _pick_away_from_head(self, rng, head):
+        """在若干随机空闲格子中选取离蛇头最远的一个"""
+        head_x, head_y = head
+        best_cell = None
+        best_distance = -1
+        for _ in range(self.away_samples):
+            cell = self.free_cells.random_cell(rng)
+            distance = abs(cell % self.grid_width - head_x) + abs(cell // self.grid_width - head_y)
+            if distance > best_distance:
+                best_cell = cell
+                best_distance = distance
+        return best_cell
+    
+    def _pick_cluster(self, rng, foods):
+        """在已有食物附近选取空闲格子，找不到时退回均匀随机"""
+        anchors = list(foods)
+        radius = self.cluster_radius
+        for _ in range(self.cluster_attempts):
+            anchor_x, anchor_y = anchors[rng.randrange(len(anchors))]
+            x = anchor_x + rng.randint(-radius, radius)
+            y = anchor_y + rng.randint(-radius, radius)
+            if 0 <= x < self.grid_width and 0 <= y < self.grid_height:
+                cell = y * self.grid_width + x
+                if cell in self.free_cells:
+                    return cell
+        return self.free_cells.random_cell(rng)
\ No newline at end of file
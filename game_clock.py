@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+游戏时钟模块
+提供可替换的毫秒时钟：实时时钟与可手动推进的时钟
+"""
+
+class PygameClock:
+    """基于 pygame.time.get_ticks() 的实时时钟"""
+    
+    def __init__(self):
+        """初始化时钟"""
+        import pygame
+        self._get_ticks = pygame.time.get_ticks
+    
+    def get_ticks(self):
+        """获取当前时间（毫秒）"""
+        return self._get_ticks()
+
+class ManualClock:
+    """手动推进的时钟（用于回放、测试与无等待快进）"""
+    
+    def __init__(self, start_ticks=0):
+        """初始化时钟"""
+        self.ticks = start_ticks
+    
+    def get_ticks(self):
+        """获取当前时间（毫秒）"""
+        return self.ticks
+    
+    def advance(self, milliseconds):
+        """将时钟向前推进指定毫秒数"""
+        self.ticks += milliseconds
+        return self.ticks
\ No newline at end of file
@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+游戏模拟核心模块
+纯规则层：蛇体移动、碰撞检测、食物生成与胜利判定
+不依赖pygame的显示、时钟与字体，可在无显示环境中高速运行
+"""
+
+import random
+from array import array
+from enum import Enum
+from food_spawner import FoodSpawner
+
+class Direction(Enum):
+    """方向枚举"""
+    UP = (0, -1)
+    DOWN = (0, 1)
+    LEFT = (-1, 0)
+    RIGHT = (1, 0)
+
+# 相反方向（用于禁止原地掉头）
+OPPOSITE_DIRECTIONS = {
+    Direction.UP: Direction.DOWN,
+    Direction.DOWN: Direction.UP,
+    Direction.LEFT: Direction.RIGHT,
+    Direction.RIGHT: Direction.LEFT
+}
+
+class GameState(Enum):
+    """游戏状态枚举"""
+    PLAYING = "playing"
+    PAUSED = "paused"
+    GAME_OVER = "game_over"
+    VICTORY = "victory"
+
+class GameEvent(Enum):
+    """模拟步进产生的事件类型"""
+    MOVED = "moved"                # 数据: (新蛇头, 旧蛇头, 移除的蛇尾或None)
+    FOOD_EATEN = "food_eaten"      # 数据: 食物位置
+    FOOD_SPAWNED = "food_spawned"  # 数据: 食物位置
+    GAME_OVER = "game_over"        # 数据: 碰撞位置
+    VICTORY = "victory"            # 数据: 蛇长度
+
+# 占用网格中的格子类型
+CELL_EMPTY = 0
+CELL_BODY = 1
+CELL_HEAD = 2
+CELL_FOOD = 3
+
+class SnakeBody:
+    """蛇身环形缓冲区（按格子索引存储，每节4字节，头尾操作O(1)）
+    
+    索引与迭代均返回网格坐标，0为蛇头，-1为蛇尾。
+    """
+    
+    def __init__(self, grid_width, capacity):
+        """初始化蛇身缓冲区"""
+        self.grid_width = grid_width
+        self.capacity = capacity
+        self.cells = array('i', bytes(4 * capacity))
+        self.head_ptr = 0
+        self.length = 0
+    
+    def clear(self):
+        """清空蛇身"""
+        self.head_ptr = 0
+        self.length = 0
+    
+    def push_head(self, cell):
+        """在蛇头前加入一节"""
+        self.head_ptr = (self.head_ptr + 1) % self.capacity
+        self.cells[self.head_ptr] = cell
+        self.length += 1
+    
+    def pop_tail(self):
+        """移除蛇尾并返回其格子索引"""
+        cell = self.cells[(self.head_ptr - self.length + 1) % self.capacity]
+        self.length -= 1
+        return cell
+    
+    def cell_at(self, index):
+        """获取第index节的格子索引（0为蛇头，支持负数）"""
+        if index < 0:
+            index += self.length
+        if not 0 <= index < self.length:
+            raise IndexError("蛇身索引超出范围")
+        return self.cells[(self.head_ptr - index) % self.capacity]
+    
+    def iter_cells(self):
+        """从蛇头到蛇尾依次产生格子索引"""
+        cells = self.cells
+        capacity = self.capacity
+        head_ptr = self.head_ptr
+        for i in range(self.length):
+            yield cells[(head_ptr - i) % capacity]
+    
+    def __len__(self):
+        return self.length
+    
+    def __getitem__(self, index):
+        cell = self.cell_at(index)
+        return (cell % self.grid_width, cell // self.grid_width)
+    
+    def __iter__(self):
+        width = self.grid_width
+        for cell in self.iter_cells():
+            yield (cell % width, cell // width)
+
+class SnakeSimulation:
+    """贪吃蛇模拟核心类（无显示、无时钟）"""
+    
+    def __init__(self, grid_width=20, grid_height=15, spawn_strategy="uniform", seed=None,
+                 victory_length=300):
+        """初始化模拟（相同种子与相同输入序列得到完全相同的结果）
+        
+        棋盘尺寸可配置（至少支持1000x1000），每步开销与蛇长无关。
+        """
+        # 游戏区域设置
+        self.grid_width = grid_width
+        self.grid_height = grid_height
+        self.cell_count = grid_width * grid_height
+        
+        # 规则参数
+        self.max_foods = 20
+        self.victory_length = min(victory_length, self.cell_count)
+        self.food_score = 10
+        
+        # 蛇身环形缓冲区（容量为棋盘格子数）
+        self.snake = SnakeBody(grid_width, self.cell_count)
+        
+        # 占用网格（每格一个字节，按行存储），碰撞与吃食物检测均为O(1)
+        self.grid = bytearray(self.grid_width * self.grid_height)
+        
+        # 食物生成器（维护空闲格子索引，保证生成总能结束）
+        self.food_spawner = FoodSpawner(self.grid_width, self.grid_height, spawn_strategy)
+        
+        # 食物变化计数（供自动驾驶等判断是否需要重新寻路，跨局单调递增）
+        self.food_version = 0
+        
+        # 每局独立的随机数生成器（不使用全局random状态）
+        self.rng = random.Random()
+        self.seed = None
+        
+        self.reset(seed if seed is not None else random.randrange(2 ** 63))
+    
+    def reset(self, seed=None):
+        """重置模拟状态
+        
+        未指定种子时由上一局的随机数生成器派生新种子，保证连续多局同样可复现。
+        """
+        if seed is None:
+            seed = self.rng.getrandbits(63)
+        self.seed = seed
+        self.rng.seed(seed)
+        
+        # 原地清空占用网格（保持同一缓冲区，外部视图不失效）
+        self.grid[:] = bytes(len(self.grid))
+        self.food_spawner.reset()
+        
+        # 蛇的初始位置（棋盘中心）
+        start = self.cell_index((self.grid_width // 2, self.grid_height // 2))
+        self.snake.clear()
+        self.snake.push_head(start)
+        self.grid[start] = CELL_HEAD
+        self.food_spawner.free_cells.remove(start)
+        self.direction = Direction.RIGHT
+        self.next_direction = Direction.RIGHT
+        
+        # 食物位置索引（按格子索引，保持生成顺序）
+        self.foods = {}
+        self.generate_initial_foods()
+        
+        # 游戏状态
+        self.state = GameState.PLAYING
+        self.score = 0
+        self.tick_count = 0
+        self.death_cause = None  # "wall" 撞墙 或 "self" 撞到自身
+    
+    def cell_index(self, pos):
+        """将网格坐标转换为占用网格中的索引"""
+        return pos[1] * self.grid_width + pos[0]
+    
+    def is_inside(self, pos):
+        """检查坐标是否在棋盘范围内"""
+        x, y = pos
+        return 0 <= x < self.grid_width and 0 <= y < self.grid_height
+    
+    def set_snake(self, positions, direction=Direction.RIGHT):
+        """直接摆放蛇身（positions 从蛇头到蛇尾，用于测试、基准与残局）"""
+        grid = self.grid
+        free_cells = self.food_spawner.free_cells
+        for cell in self.snake.iter_cells():
+            grid[cell] = CELL_EMPTY
+            free_cells.add(cell)
+        
+        self.snake.clear()
+        for pos in reversed(positions):
+            cell = self.cell_index(pos)
+            if grid[cell] == CELL_FOOD:
+                del self.foods[pos]
+                self.food_version += 1
+            grid[cell] = CELL_BODY
+            free_cells.remove(cell)
+            self.snake.push_head(cell)
+        grid[self.snake.cell_at(0)] = CELL_HEAD
+        
+        self.direction = direction
+        self.next_direction = direction
+    
+    def is_snake_cell(self, pos):
+        """检查格子是否被蛇身占用"""
+        cell = self.grid[self.cell_index(pos)]
+        return cell == CELL_BODY or cell == CELL_HEAD
+    
+    def add_food(self, food_pos):
+        """在指定位置放置食物"""
+        index = self.cell_index(food_pos)
+        self.foods[food_pos] = None
+        self.food_version += 1
+        self.grid[index] = CELL_FOOD
+        self.food_spawner.free_cells.remove(index)
+    
+    def generate_food(self):
+        """生成单个食物位置（从空闲格子索引中选取，棋盘已满时返回None）"""
+        return self.food_spawner.pick(self.rng, self.snake[0], self.foods)
+    
+    def generate_initial_foods(self):
+        """生成初始食物（3-5个）"""
+        for food_pos in self.foods:
+            index = self.cell_index(food_pos)
+            self.grid[index] = CELL_EMPTY
+            self.food_spawner.free_cells.add(index)
+        self.foods.clear()
+        initial_count = self.rng.randint(3, 5)
+        for _ in range(initial_count):
+            food_pos = self.generate_food()
+            if food_pos is None:
+                break
+            self.add_food(food_pos)
+    
+    def maintain_foods(self, events=None):
+        """维持食物数量（确保场上有足够的食物）"""
+        # 计算需要生成的食物数量
+        target_count = min(self.max_foods, max(5, len(self.snake) // 10 + 3))
+        
+        while len(self.foods) < target_count:
+            food_pos = self.generate_food()
+            if food_pos is None:
+                # 棋盘已无空闲格子
+                break
+            self.add_food(food_pos)
+            if events is not None:
+                events.append((GameEvent.FOOD_SPAWNED, food_pos))
+    
+    def set_direction(self, direction):
+        """设置下一步方向（禁止直接掉头），返回是否被接受"""
+        if direction == OPPOSITE_DIRECTIONS[self.direction]:
+            return False
+        self.next_direction = direction
+        return True
+    
+    def step(self, action=None):
+        """推进一个逻辑步，返回 (状态, 事件列表)"""
+        events = []
+        if self.state != GameState.PLAYING:
+            return self.state, events
+        
+        if action is not None:
+            self.set_direction(action)
+        
+        self.tick_count += 1
+        
+        # 更新方向
+        self.direction = self.next_direction
+        
+        # 移动蛇头
+        old_head = self.snake[0]
+        dx, dy = self.direction.value
+        new_head = (old_head[0] + dx, old_head[1] + dy)
+        
+        # 检查碰撞
+        if self.check_collision(new_head):
+            self.death_cause = "self" if self.is_inside(new_head) else "wall"
+            self.state = GameState.GAME_OVER
+            events.append((GameEvent.GAME_OVER, new_head))
+            return self.state, events
+        
+        # 检查是否吃到食物（按格子索引O(1)查找）
+        grid = self.grid
+        head_index = self.cell_index(new_head)
+        food_eaten = grid[head_index] == CELL_FOOD
+        if food_eaten:
+            self.score += self.food_score
+            del self.foods[new_head]
+            self.food_version += 1
+        
+        # 移动蛇
+        grid[self.snake.cell_at(0)] = CELL_BODY
+        self.snake.push_head(head_index)
+        grid[head_index] = CELL_HEAD
+        if not food_eaten:
+            self.food_spawner.free_cells.remove(head_index)
+        
+        if food_eaten:
+            events.append((GameEvent.MOVED, (new_head, old_head, None)))
+            events.append((GameEvent.FOOD_EATEN, new_head))
+            
+            # 维持食物数量
+            self.maintain_foods(events)
+            
+            # 检查胜利条件（蛇长度达到胜利长度，默认300）
+            if len(self.snake) >= self.victory_length:
+                self.state = GameState.VICTORY
+                events.append((GameEvent.VICTORY, len(self.snake)))
+        else:
+            # 没吃到食物，移除尾部
+            tail_index = self.snake.pop_tail()
+            old_tail = (tail_index % self.grid_width, tail_index // self.grid_width)
+            grid[tail_index] = CELL_EMPTY
+            self.food_spawner.free_cells.add(tail_index)
+            events.append((GameEvent.MOVED, (new_head, old_head, old_tail)))
+        
+        return self.state, events
+    
+    def check_collision(self, pos):
+        """检查碰撞"""
+        x, y = pos
+        
+        # 检查边界碰撞
+        if x < 0 or x >= self.grid_width or y < 0 or y >= self.grid_height:
+            return True
+        
+        # 检查自身碰撞（占用网格O(1)查询）
+        if self.is_snake_cell(pos):
+            return True
+        
+        return False
\ No newline at end of file
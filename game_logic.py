@@ -7,35 +7,42 @@
 
 import pygame
 import random
-from enum import Enum
-
-class Direction(Enum):
-    """方向枚举"""
-    UP = (0, -1)
-    DOWN = (0, 1)
-    LEFT = (-1, 0)
-    RIGHT = (1, 0)
-
-class GameState(Enum):
-    """游戏状态枚举"""
-    PLAYING = "playing"
-    PAUSED = "paused"
-    GAME_OVER = "game_over"
-    VICTORY = "victory"
+from game_core import (Direction, GameEvent, GameState, SnakeSimulation,
+                       CELL_EMPTY, CELL_BODY, CELL_HEAD, CELL_FOOD)
+from game_clock import PygameClock
+from replay import ReplayRecorder
+from autopilot import Autopilot
+from text_cache import render_text
+from font_service import get_chinese_font
 
 class SnakeGame:
     """贪吃蛇游戏核心类"""
     
-    def __init__(self, screen, skin_manager, score_manager):
-        """初始化游戏"""
+    def __init__(self, screen, skin_manager, score_manager, clock=None, seed=None,
+                 grid_width=20, grid_height=15, cell_size=None, victory_length=300):
+        """初始化游戏（cell_size 为None时按屏幕大小自动适配）"""
         self.screen = screen
         self.skin_manager = skin_manager
         self.score_manager = score_manager
         
+        # 可替换的时钟（默认使用pygame实时时钟）
+        self.clock = clock or PygameClock()
+        
+        # 模拟核心（纯规则，无显示依赖，按种子复现）
+        self.core = SnakeSimulation(grid_width, grid_height, seed=seed, victory_length=victory_length)
+        
+        # 回放播放模式下不录制输入、不记录分数
+        self.playback = False
+        
+        # 自动驾驶（按TAB切换，用于演示模式；构造哈密顿回路开销较大，首次开启时才创建）
+        self.autopilot = None
+        self.autopilot_enabled = False
+        
         # 游戏区域设置
-        self.grid_width = 20
-        self.grid_height = 15
-        self.cell_size = 30
+        self.grid_width = self.core.grid_width
+        self.grid_height = self.core.grid_height
+        self.victory_length = self.core.victory_length
+        self.cell_size = cell_size or self._fit_cell_size(screen)
         self.game_area_width = self.grid_width * self.cell_size
         self.game_area_height = self.grid_height * self.cell_size
         
@@ -45,12 +52,24 @@ class SnakeGame:
         self.game_area_x = (screen_width - self.game_area_width) // 2
         self.game_area_y = (screen_height - self.game_area_height) // 2 + 30  # 留出顶部状态栏空间
         
+        # 脏矩形：自上次绘制以来变化的格子，超过上限时改为整屏重绘
+        self.dirty_cells = []
+        self.max_dirty_cells = 64
+        self.full_redraw = True
+        self._drawn_ui_key = None
+        
+        # 棋盘图层：蛇与食物常驻在这张表面上，每步只重绘变化的格子
+        self.board_surface = None
+        self.board_dirty = True
+        self.board_atlas = None
+        self.board_tiles = {}
+        
         # 初始化游戏状态
-        self.reset_game()
+        self.reset_game(seed)
         
         # 字体 - 使用系统中文字体
-        self.font = self._get_chinese_font(24)
-        self.big_font = self._get_chinese_font(48)
+        self.font = get_chinese_font(24)
+        self.big_font = get_chinese_font(48)
         
         # 游戏计时
         self.last_move_time = 0
@@ -60,77 +79,60 @@ class SnakeGame:
         
         # 按键状态跟踪
         self.keys_pressed = set()
+        self.is_accelerating = False
     
-    def _get_chinese_font(self, size):
-        """获取支持中文的字体"""
-        # 尝试加载系统中文字体，按优先级排序
-        font_names = [
-            'Microsoft YaHei',  # 微软雅黑
-            'SimHei',           # 黑体
-            'SimSun',           # 宋体
-            'KaiTi',            # 楷体
-            'FangSong',         # 仿宋
-            'Arial Unicode MS', # Arial Unicode
-            'DejaVu Sans',      # Linux常用字体
-            'Noto Sans CJK SC'  # Google Noto字体
-        ]
-        
-        for font_name in font_names:
-            try:
-                font = pygame.font.SysFont(font_name, size)
-                # 测试字体是否支持中文
-                test_surface = font.render('测试', True, (255, 255, 255))
-                if test_surface.get_width() > 0:
-                    return font
-            except:
-                continue
-        
-        # 如果所有字体都失败，使用默认字体
-        return pygame.font.Font(None, size)
-    
-    def reset_game(self):
-        """重置游戏状态"""
-        # 蛇的初始位置（网格坐标）
-        self.snake = [(self.grid_width // 2, self.grid_height // 2)]
-        self.direction = Direction.RIGHT
-        self.next_direction = Direction.RIGHT
-        
-        # 食物位置列表（支持多个食物）
-        self.foods = []
-        self.max_foods = 20
+    def _fit_cell_size(self, screen):
+        """计算能放下整个棋盘的格子大小（最大30像素，最小1像素）"""
+        available_width = screen.get_width() - 20
+        available_height = screen.get_height() - 70  # 顶部状态栏与底部留白
+        fit = min(available_width // self.grid_width, available_height // self.grid_height)
+        return max(1, min(30, fit))
+    
+    @property
+    def snake(self):
+        """蛇体坐标队列（蛇头在前）"""
+        return self.core.snake
+    
+    @property
+    def foods(self):
+        """食物位置索引（可迭代，按生成顺序）"""
+        return self.core.foods
+    
+    @property
+    def score(self):
+        """当前分数"""
+        return self.core.score
+    
+    @property
+    def state(self):
+        """当前游戏状态"""
+        return self.core.state
+    
+    @state.setter
+    def state(self, value):
+        self.core.state = value
+    
+    @property
+    def direction(self):
+        """当前移动方向"""
+        return self.core.direction
+    
+    def reset_game(self, seed=None):
+        """重置游戏状态（未指定种子时由上一局派生）"""
+        self.core.reset(seed)
         
         # 为本局游戏选择食物颜色
         self.select_food_color()
         
-        self.generate_initial_foods()
+        # 本局输入录制（种子 + 每步输入）
+        self.recorder = ReplayRecorder(self.grid_width, self.grid_height, self.core.seed,
+                                       self.victory_length)
+        if self.autopilot is not None:
+            self.autopilot.reset()
+        self.full_redraw = True
+        self.board_dirty = True
         
-        # 游戏状态
-        self.state = GameState.PLAYING
-        self.score = 0
-        self.start_time = pygame.time.get_ticks()
-    
-    def generate_food(self):
-        """生成单个食物位置"""
-        while True:
-            food_pos = (random.randint(0, self.grid_width - 1), 
-                       random.randint(0, self.grid_height - 1))
-            if food_pos not in self.snake and food_pos not in self.foods:
-                return food_pos
-    
-    def generate_initial_foods(self):
-        """生成初始食物（3-5个）"""
-        self.foods = []
-        initial_count = random.randint(3, 5)
-        for _ in range(initial_count):
-            self.foods.append(self.generate_food())
-    
-    def maintain_foods(self):
-        """维持食物数量（确保场上有足够的食物）"""
-        # 计算需要生成的食物数量
-        target_count = min(self.max_foods, max(5, len(self.snake) // 10 + 3))
-        
-        while len(self.foods) < target_count:
-            self.foods.append(self.generate_food())
+        self.start_time = self.clock.get_ticks()
     
     def handle_event(self, event):
         """处理事件"""
@@ -148,20 +150,21 @@ class SnakeGame:
             elif event.key == pygame.K_F11:
                 return "toggle_fullscreen"
             
+            elif event.key == pygame.K_TAB and self.state == GameState.PLAYING:
+                self.autopilot_enabled = not self.autopilot_enabled
+                if self.autopilot_enabled and self.autopilot is None:
+                    self.autopilot = Autopilot(self.core)
+            
             # 方向控制
             elif self.state == GameState.PLAYING:
                 if event.key in [pygame.K_UP, pygame.K_w]:
-                    if self.direction != Direction.DOWN:
-                        self.next_direction = Direction.UP
+                    self.core.set_direction(Direction.UP)
                 elif event.key in [pygame.K_DOWN, pygame.K_s]:
-                    if self.direction != Direction.UP:
-                        self.next_direction = Direction.DOWN
+                    self.core.set_direction(Direction.DOWN)
                 elif event.key in [pygame.K_LEFT, pygame.K_a]:
-                    if self.direction != Direction.RIGHT:
-                        self.next_direction = Direction.LEFT
+                    self.core.set_direction(Direction.LEFT)
                 elif event.key in [pygame.K_RIGHT, pygame.K_d]:
-                    if self.direction != Direction.LEFT:
-                        self.next_direction = Direction.RIGHT
+                    self.core.set_direction(Direction.RIGHT)
             
             # 暂停菜单选项
             elif self.state == GameState.PAUSED:
@@ -194,67 +197,82 @@ class SnakeGame:
             pygame.K_LEFT, pygame.K_a, pygame.K_RIGHT, pygame.K_d
         }
         
-        is_accelerating = bool(self.keys_pressed & direction_keys)
-        self.move_delay = self.fast_move_delay if is_accelerating else self.base_move_delay
+        self.is_accelerating = bool(self.keys_pressed & direction_keys)
+        self.move_delay = self.fast_move_delay if self.is_accelerating else self.base_move_delay
         
-        current_time = pygame.time.get_ticks()
+        current_time = self.clock.get_ticks()
         if current_time - self.last_move_time >= self.move_delay:
             self.last_move_time = current_time
-            
-            # 更新方向
-            self.direction = self.next_direction
-            
-            # 移动蛇头
-            head_x, head_y = self.snake[0]
-            dx, dy = self.direction.value
-            new_head = (head_x + dx, head_y + dy)
-            
-            # 检查碰撞
-            if self.check_collision(new_head):
-                self.state = GameState.GAME_OVER
-                self.score_manager.update_high_score(self.score)
-                return "game_over"
-            
-            # 移动蛇
-            self.snake.insert(0, new_head)
-            
-            # 检查是否吃到食物
-            food_eaten = False
-            for food_pos in self.foods[:]:
-                if new_head == food_pos:
-                    self.score += 10
-                    self.foods.remove(food_pos)
-                    food_eaten = True
-                    break
-            
-            if food_eaten:
-                # 维持食物数量
-                self.maintain_foods()
-                
-                # 检查胜利条件（蛇长度达到300）
-                if len(self.snake) >= 300:
-                    self.state = GameState.VICTORY
-                    self.score_manager.update_high_score(self.score)
-                    return "victory"
-            else:
-                # 没吃到食物，移除尾部
-                self.snake.pop()
+            if self.autopilot_enabled:
+                direction = self.autopilot.decide()
+                if direction is not None:
+                    self.core.set_direction(direction)
+            return self.advance(self.core.next_direction, self.is_accelerating)
         
         return None
     
+    def advance(self, direction, accelerating):
+        """推进模拟核心一步（正常游戏与回放共用）"""
+        self.is_accelerating = accelerating
+        if not self.playback:
+            self.recorder.record(direction, accelerating)
+        
+        state, events = self.core.step(direction)
+        self._mark_dirty(events)
+        self._update_board(events)
+        
+        if state == GameState.GAME_OVER:
+            if not self.playback:
+                self.score_manager.update_high_score(self.score, skin=self.skin_manager.get_current_skin())
+            return "game_over"
+        elif state == GameState.VICTORY:
+            if not self.playback:
+                self.score_manager.update_high_score(self.score, skin=self.skin_manager.get_current_skin())
+            return "victory"
+        
+        return None
+    
+    def _mark_dirty(self, events):
+        """根据模拟事件记录变化的格子"""
+        if self.full_redraw:
+            return
+        dirty_cells = self.dirty_cells
+        for event, data in events:
+            if event == GameEvent.MOVED:
+                dirty_cells.extend(cell for cell in data if cell is not None)
+            elif event == GameEvent.FOOD_EATEN or event == GameEvent.FOOD_SPAWNED:
+                dirty_cells.append(data)
+        if len(dirty_cells) > self.max_dirty_cells:
+            self.full_redraw = True
+            dirty_cells.clear()
+    
+    def _ui_key(self):
+        """状态栏显示内容（变化时才需要刷新状态栏）"""
+        return (self.state, self.score, len(self.snake), len(self.foods),
+                self.score_manager.get_high_score(), self.is_accelerating, self.autopilot_enabled)
+    
+    def collect_dirty_rects(self):
+        """取出自上次绘制以来需要刷新的屏幕区域（None 表示整屏，空列表表示无变化）"""
+        ui_key = self._ui_key()
+        if self.full_redraw or self.state == GameState.VICTORY or ui_key[0] != self._drawn_ui_key[0]:
+            # 首帧、重开或状态切换（暂停/结束遮罩）时整屏重绘；胜利界面显示实时用时
+            rects = None
+        else:
+            rects = []
+            for cell in self.dirty_cells:
+                x, y = self.grid_to_screen(cell)
+                rects.append(pygame.Rect(x, y, self.cell_size, self.cell_size))
+            if ui_key != self._drawn_ui_key:
+                rects.append(pygame.Rect(0, 0, self.screen.get_width(), 30))
+        
+        self.dirty_cells.clear()
+        self.full_redraw = False
+        self._drawn_ui_key = ui_key
+        return rects
+    
     def check_collision(self, pos):
         """检查碰撞"""
-        x, y = pos
-        
-        # 检查边界碰撞
-        if x < 0 or x >= self.grid_width or y < 0 or y >= self.grid_height:
-            return True
-        
-        # 检查自身碰撞
-        if pos in self.snake:
-            return True
-        
-        return False
+        return self.core.check_collision(pos)
     
     def grid_to_screen(self, grid_pos):
         """将网格坐标转换为屏幕坐标"""
@@ -271,20 +289,75 @@ class SnakeGame:
         pygame.draw.rect(self.screen, (15, 52, 96), game_rect)  # 深蓝色背景
         pygame.draw.rect(self.screen, (233, 69, 96), game_rect, 2)  # 金黄色边框
     
-    def draw_snake(self):
-        """绘制蛇"""
-        current_skin = self.skin_manager.get_current_skin_info()
+    def invalidate_board(self):
+        """标记棋盘图层需要整体重绘（直接修改蛇身、更换皮肤或显示模式变化后调用）"""
+        self.board_dirty = True
+    
+    def _render_board(self):
+        """整体重绘棋盘图层"""
+        size = (self.game_area_width, self.game_area_height)
+        if self.board_surface is None or self.board_surface.get_size() != size:
+            self.board_surface = pygame.Surface(size)
+            if pygame.display.get_surface() is not None:
+                self.board_surface = self.board_surface.convert()
+        
+        board_rect = self.board_surface.get_rect()
+        self.board_surface.fill((15, 52, 96))  # 深蓝色背景
+        pygame.draw.rect(self.board_surface, (233, 69, 96), board_rect, 2)  # 金黄色边框
+        
+        # 皮肤图块（含装饰与食物形状）只绘制一次，之后每个格子都是一次区域blit
+        tile_size = (self.cell_size, self.cell_size)
+        self.board_atlas, areas = self.skin_manager.get_atlas(
+            self.skin_manager.get_current_skin(), tile_size, self.food_color)
+        self.board_tiles = {
+            CELL_HEAD: areas["head"],
+            CELL_BODY: areas["body"],
+            CELL_FOOD: areas["food"]
+        }
         
-        for i, segment in enumerate(self.snake):
-            screen_pos = self.grid_to_screen(segment)
-            rect = pygame.Rect(screen_pos[0], screen_pos[1], self.cell_size, self.cell_size)
-            
-            if i == 0:  # 蛇头
-                pygame.draw.rect(self.screen, current_skin['head_color'], rect)
-            else:  # 蛇身
-                pygame.draw.rect(self.screen, current_skin['body_color'], rect)
-            
-            pygame.draw.rect(self.screen, (255, 255, 255), rect, 1)  # 边框
+        self.draw_food()  # 先绘制食物
+        self.draw_snake()  # 后绘制蛇
+        self.board_dirty = False
+    
+    def _paint_cell(self, pos):
+        """按占用网格的当前内容重绘棋盘图层上的一个格子"""
+        x, y = pos
+        rect = pygame.Rect(x * self.cell_size, y * self.cell_size, self.cell_size, self.cell_size)
+        code = self.core.grid[self.core.cell_index(pos)]
+        
+        # 先恢复背景（食物等图块带透明部分）
+        self.board_surface.fill((15, 52, 96), rect)
+        # 边缘格子补回被覆盖的游戏区域边框
+        if x == 0 or y == 0 or x == self.grid_width - 1 or y == self.grid_height - 1:
+            self.board_surface.set_clip(rect)
+            pygame.draw.rect(self.board_surface, (233, 69, 96), self.board_surface.get_rect(), 2)
+            self.board_surface.set_clip(None)
+        
+        if code != CELL_EMPTY:
+            self.board_surface.blit(self.board_atlas, rect, self.board_tiles[code])
+    
+    def _update_board(self, events):
+        """根据模拟事件增量更新棋盘图层：新蛇头、旧蛇头、移除的蛇尾与食物变化"""
+        if self.board_dirty:
+            return  # 下次绘制时会整体重绘
+        for event, data in events:
+            if event == GameEvent.MOVED:
+                for pos in data:
+                    if pos is not None:
+                        self._paint_cell(pos)
+            elif event == GameEvent.FOOD_EATEN or event == GameEvent.FOOD_SPAWNED:
+                self._paint_cell(data)
+    
+    def draw_board(self):
+        """绘制棋盘图层（一次blit）"""
+        if self.board_dirty:
+            self._render_board()
+        self.screen.blit(self.board_surface, (self.game_area_x, self.game_area_y))
+    
+    def draw_snake(self):
+        """在棋盘图层上绘制整条蛇"""
+        for segment in self.snake:
+            self._paint_cell(segment)
     
     def select_food_color(self):
         """为本局游戏选择食物颜色"""
@@ -334,7 +407,8 @@ class SnakeGame:
             valid_colors = [(255, 69, 0), (255, 215, 0), (50, 205, 50)]
         
         # 随机选择一种颜色作为本局的食物颜色
-        self.food_color = random.choice(valid_colors)
+        # 使用由本局种子派生的独立随机数，不影响模拟核心的随机序列（保证回放与皮肤无关）
+        self.food_color = random.Random(self.core.seed).choice(valid_colors)
     
     def _color_similarity(self, color1, color2):
         """计算两个颜色的相似度（0-1，1表示完全相同）"""
@@ -350,14 +424,9 @@ class SnakeGame:
         return similarity
     
     def draw_food(self):
-        """绘制所有食物（统一颜色）"""
+        """在棋盘图层上绘制所有食物（皮肤的食物形状，统一使用本局选定的食物颜色）"""
         for food_pos in self.foods:
-            screen_pos = self.grid_to_screen(food_pos)
-            rect = pygame.Rect(screen_pos[0], screen_pos[1], self.cell_size, self.cell_size)
-            
-            # 使用本局选定的统一食物颜色
-            pygame.draw.rect(self.screen, self.food_color, rect)
-            pygame.draw.rect(self.screen, (255, 255, 255), rect, 1)  # 边框
+            self._paint_cell(food_pos)
     
     def draw_ui(self):
         """绘制用户界面"""
@@ -366,19 +435,19 @@ class SnakeGame:
         pygame.draw.rect(self.screen, (22, 22, 46), status_rect)
         
         # 分数
-        score_text = self.font.render(f"分数: {self.score}", True, (255, 255, 255))
+        score_text = render_text(self.font, f"分数: {self.score}", (255, 255, 255))
         self.screen.blit(score_text, (10, 5))
         
         # 蛇长度
-        length_text = self.font.render(f"长度: {len(self.snake)}/300", True, (255, 255, 255))
+        length_text = render_text(self.font, f"长度: {len(self.snake)}/{self.victory_length}", (255, 255, 255))
         self.screen.blit(length_text, (150, 5))
         
         # 食物数量
-        food_count_text = self.font.render(f"食物: {len(self.foods)}", True, (255, 255, 255))
+        food_count_text = render_text(self.font, f"食物: {len(self.foods)}", (255, 255, 255))
         self.screen.blit(food_count_text, (280, 5))
         
         # 进度条
-        progress = len(self.snake) / 300
+        progress = min(1, len(self.snake) / self.victory_length)
         progress_width = 180
         progress_rect = pygame.Rect(360, 8, progress_width, 14)
         pygame.draw.rect(self.screen, (60, 60, 60), progress_rect)
@@ -389,18 +458,15 @@ class SnakeGame:
         
         # 最高分
         high_score = self.score_manager.get_high_score()
-        high_score_text = self.font.render(f"最高分: {high_score}", True, (255, 255, 255))
+        high_score_text = render_text(self.font, f"最高分: {high_score}", (255, 255, 255))
         self.screen.blit(high_score_text, (560, 5))
         
         # 速度指示器
-        direction_keys = {
-            pygame.K_UP, pygame.K_w, pygame.K_DOWN, pygame.K_s,
-            pygame.K_LEFT, pygame.K_a, pygame.K_RIGHT, pygame.K_d
-        }
-        is_accelerating = bool(self.keys_pressed & direction_keys)
-        speed_text = "加速中" if is_accelerating else "正常速度"
-        speed_color = (255, 100, 100) if is_accelerating else (100, 255, 100)
-        speed_surface = self.font.render(speed_text, True, speed_color)
+        speed_text = "加速中" if self.is_accelerating else "正常速度"
+        if self.autopilot_enabled:
+            speed_text = "自动驾驶"
+        speed_color = (255, 100, 100) if self.is_accelerating else (100, 255, 100)
+        speed_surface = render_text(self.font, speed_text, speed_color)
         self.screen.blit(speed_surface, (700, 5))
     
     def draw_pause_menu(self):
@@ -412,17 +478,17 @@ class SnakeGame:
         self.screen.blit(overlay, (0, 0))
         
         # 暂停文字
-        pause_text = self.big_font.render("PAUSED", True, (255, 255, 255))
+        pause_text = render_text(self.big_font, "PAUSED", (255, 255, 255))
         pause_rect = pause_text.get_rect(center=(self.screen.get_width()//2, self.screen.get_height()//2 - 50))
         self.screen.blit(pause_text, pause_rect)
         
         # 提示文字
-        hint_text = self.font.render("按ESC继续 | 按M返回主菜单 | 按F11切换全屏", True, (255, 255, 255))
+        hint_text = render_text(self.font, "按ESC继续 | 按M返回主菜单 | 按F11切换全屏", (255, 255, 255))
         hint_rect = hint_text.get_rect(center=(self.screen.get_width()//2, self.screen.get_height()//2 + 20))
         self.screen.blit(hint_text, hint_rect)
         
         # 加速提示
-        speed_hint = self.font.render("长按方向键加速移动", True, (200, 200, 200))
+        speed_hint = render_text(self.font, "长按方向键加速移动", (200, 200, 200))
         speed_rect = speed_hint.get_rect(center=(self.screen.get_width()//2, self.screen.get_height()//2 + 50))
         self.screen.blit(speed_hint, speed_rect)
     
@@ -435,17 +501,17 @@ class SnakeGame:
         self.screen.blit(overlay, (0, 0))
         
         # 游戏结束文字
-        game_over_text = self.big_font.render("GAME OVER", True, (255, 0, 0))
+        game_over_text = render_text(self.big_font, "GAME OVER", (255, 0, 0))
         game_over_rect = game_over_text.get_rect(center=(self.screen.get_width()//2, self.screen.get_height()//2 - 50))
         self.screen.blit(game_over_text, game_over_rect)
         
         # 最终分数
-        final_score_text = self.font.render(f"最终分数: {self.score}", True, (255, 255, 255))
+        final_score_text = render_text(self.font, f"最终分数: {self.score}", (255, 255, 255))
         final_score_rect = final_score_text.get_rect(center=(self.screen.get_width()//2, self.screen.get_height()//2))
         self.screen.blit(final_score_text, final_score_rect)
         
         # 提示文字
-        hint_text = self.font.render("按回车重新开始 | 按M返回主菜单", True, (255, 255, 255))
+        hint_text = render_text(self.font, "按回车重新开始 | 按M返回主菜单", (255, 255, 255))
         hint_rect = hint_text.get_rect(center=(self.screen.get_width()//2, self.screen.get_height()//2 + 30))
         self.screen.blit(hint_text, hint_rect)
     
@@ -458,35 +524,33 @@ class SnakeGame:
         self.screen.blit(overlay, (0, 0))
         
         # 胜利文字（带发光效果）
-        victory_text = self.big_font.render("VICTORY!", True, (255, 215, 0))
+        victory_text = render_text(self.big_font, "VICTORY!", (255, 215, 0))
         victory_rect = victory_text.get_rect(center=(self.screen.get_width()//2, self.screen.get_height()//2 - 50))
         self.screen.blit(victory_text, victory_rect)
         
         # 最终分数
-        final_score_text = self.font.render(f"最终分数: {self.score}", True, (255, 255, 255))
+        final_score_text = render_text(self.font, f"最终分数: {self.score}", (255, 255, 255))
         final_score_rect = final_score_text.get_rect(center=(self.screen.get_width()//2, self.screen.get_height()//2))
         self.screen.blit(final_score_text, final_score_rect)
         
         # 游戏时间
-        game_time = (pygame.time.get_ticks() - self.start_time) // 1000
-        time_text = self.font.render(f"用时: {game_time}秒", True, (255, 255, 255))
+        game_time = (self.clock.get_ticks() - self.start_time) // 1000
+        time_text = render_text(self.font, f"用时: {game_time}秒", (255, 255, 255))
         time_rect = time_text.get_rect(center=(self.screen.get_width()//2, self.screen.get_height()//2 + 25))
         self.screen.blit(time_text, time_rect)
         
         # 提示文字
-        hint_text = self.font.render("按回车重新开始 | 按M返回主菜单", True, (255, 255, 255))
+        hint_text = render_text(self.font, "按回车重新开始 | 按M返回主菜单", (255, 255, 255))
         hint_rect = hint_text.get_rect(center=(self.screen.get_width()//2, self.screen.get_height()//2 + 55))
         self.screen.blit(hint_text, hint_rect)
     
     def draw(self):
         """绘制游戏画面"""
-        # 绘制游戏区域
-        self.draw_game_area()
-        
-        # 绘制游戏元素
+        # 绘制游戏区域（蛇与食物常驻在棋盘图层中，每帧只需一次blit）
         if self.state != GameState.GAME_OVER:
-            self.draw_food()  # 先绘制食物
-            self.draw_snake()  # 后绘制蛇（确保蛇在食物上方）
+            self.draw_board()
+        else:
+            self.draw_game_area()
         
         # 绘制UI
         self.draw_ui()
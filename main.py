@@ -11,10 +11,17 @@ Snake Game - Anime Edition
 
 import pygame
 import sys
+import argparse
 from ui_menu import MainMenu
 from game_logic import SnakeGame
+from game_clock import ManualClock
 from skin_manager import SkinManager
-from score_manager import ScoreManager
+from score_manager import ScoreManager, SCORE_BACKENDS
+from config_store import get_config_store
+from replay import ReplayReader, ReplayPlayback, ReplayWriter
+from profiler import FrameProfiler
+from capture import ProfileCapture, capture_seconds_from_env
+from text_cache import render_text
 
 # 游戏常量
 WIDTH = 800
@@ -25,7 +32,8 @@ TITLE = "贪吃蛇 - Anime Edition"
 class GameApp:
     """游戏主应用类"""
     
-    def __init__(self):
+    def __init__(self, replay_file=None, replay_speed=1, grid_size=(20, 15), cell_size=None,
+                 victory_length=300, profile=False, dirty_rects=False, score_backend="json"):
         """初始化游戏应用"""
         pygame.init()
         
@@ -50,12 +58,31 @@ class GameApp:
         self.running = True
         self.fullscreen = False
         
+        # 脏矩形模式：只向显示器提交变化的区域，画面无变化的帧直接跳过
+        self.dirty_rects = dirty_rects
+        self._drawn_frame_key = None
+        
+        # 帧耗时分析（F3显示叠加层，F4导出）
+        self.profiler = FrameProfiler(target_fps=FPS)
+        self.profiler.set_enabled(profile)
+        
         # 初始化管理器
-        self.skin_manager = SkinManager()
-        self.score_manager = ScoreManager()
+        # 皮肤与分数共享同一份配置文档，由后台线程写盘
+        self.config_store = get_config_store()
+        self.skin_manager = SkinManager(self.config_store)
+        self.score_manager = ScoreManager(config_store=self.config_store, backend=score_backend)
+        # 回放由后台线程写盘，并只保留最近的若干个
+        self.replay_writer = ReplayWriter()
+        
+        # cProfile + tracemalloc 采集（F5或环境变量 SNAKE_PROFILE_CAPTURE 启动），结果写在 config.json 旁
+        self.capture = ProfileCapture(self.score_manager.config_file)
+        capture_seconds = capture_seconds_from_env()
+        if capture_seconds:
+            self.capture.start(capture_seconds)
         
         # 初始化菜单和游戏
-        self.main_menu = MainMenu(self.screen, self.skin_manager, self.score_manager)
+        self.main_menu = MainMenu(self.screen, self.skin_manager, self.score_manager,
+                                  min(victory_length, grid_size[0] * grid_size[1]))
         self.snake_game = None
         
         # 导入皮肤选择菜单
@@ -63,7 +90,22 @@ class GameApp:
         self.skin_selection_menu = SkinSelectionMenu(self.screen, self.skin_manager)
         
         # 游戏状态
-        self.state = "menu"  # menu, game, skin_selection
+        self.state = "menu"  # menu, game, skin_selection, replay
+        
+        # 棋盘设置（cell_size 为 None 时按窗口自动适配）
+        self.board_options = {
+            "grid_width": grid_size[0],
+            "grid_height": grid_size[1],
+            "cell_size": cell_size,
+            "victory_length": victory_length
+        }
+        
+        # 回放设置（replay_speed 为 None 表示跳过渲染直接播放到结束）
+        self.replay_file = replay_file
+        self.replay_speed = replay_speed
+        self.replay_playback = None
+        if replay_file:
+            self.start_replay()
     
     def toggle_fullscreen(self):
         """切换全屏模式"""
@@ -72,6 +114,10 @@ class GameApp:
             self.screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
         else:
             self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
+        self.main_menu.invalidate_layout()
+        self.skin_manager.invalidate_atlas()
+        if self.snake_game:
+            self.snake_game.invalidate_board()
     
     def handle_events(self):
         """处理事件"""
@@ -82,6 +128,12 @@ class GameApp:
             elif event.type in [pygame.KEYDOWN, pygame.KEYUP]:
                 if event.type == pygame.KEYDOWN and event.key == pygame.K_F11:
                     self.toggle_fullscreen()
+                elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                    self.profiler.toggle_overlay()
+                elif event.type == pygame.KEYDOWN and event.key == pygame.K_F4:
+                    self.export_profile()
+                elif event.type == pygame.KEYDOWN and event.key == pygame.K_F5:
+                    self.capture.toggle()
                 
                 # 根据当前状态处理按键
                 if self.state == "menu":
@@ -99,6 +151,12 @@ class GameApp:
                         if result == "back_to_menu" or result == "skin_selected":
                             self.state = "menu"
                 
+                elif self.state == "replay":
+                    if event.type == pygame.KEYDOWN and event.key in [pygame.K_ESCAPE, pygame.K_m]:
+                        self.state = "menu"
+                        self.snake_game = None
+                        self.replay_playback = None
+                
                 elif self.state == "game" and self.snake_game:
                     # 游戏状态需要处理按下和释放事件
                     result = self.snake_game.handle_event(event)
@@ -124,45 +182,201 @@ class GameApp:
     
     def start_game(self):
         """开始游戏"""
-        self.snake_game = SnakeGame(self.screen, self.skin_manager, self.score_manager)
+        self.snake_game = SnakeGame(self.screen, self.skin_manager, self.score_manager,
+                                    **self.board_options)
         self.state = "game"
     
+    def start_replay(self):
+        """开始播放回放文件"""
+        try:
+            reader = ReplayReader(self.replay_file)
+        except Exception as e:
+            print(f"加载回放文件失败: {e}")
+            return
+        
+        self.snake_game = SnakeGame(self.screen, self.skin_manager, self.score_manager,
+                                    clock=ManualClock(), seed=reader.seed,
+                                    grid_width=reader.grid_width, grid_height=reader.grid_height,
+                                    cell_size=self.board_options["cell_size"],
+                                    victory_length=reader.victory_length)
+        self.snake_game.playback = True
+        self.replay_playback = ReplayPlayback(reader, self.replay_speed)
+        self.state = "replay"
+        
+        if self.replay_speed is None:
+            # 不限速：跳过中间帧的渲染，直接得到最终局面
+            self.replay_playback.run_to_end(self.snake_game)
+            print(f"回放结束: 分数 {self.snake_game.score}, 长度 {len(self.snake_game.snake)}")
+    
+    def save_replay(self):
+        """提交刚结束的对局回放（后台写盘）"""
+        try:
+            filename = self.replay_writer.submit(self.snake_game.recorder)
+            print(f"回放已保存: {filename}")
+        except Exception as e:
+            print(f"保存回放失败: {e}")
+    
     def update(self):
         """更新游戏状态"""
+        if self.capture.active:
+            self.capture.poll()
+        
         if self.state == "game" and self.snake_game:
             result = self.snake_game.update()
             if result == "game_over" or result == "victory":
+                self.save_replay()
                 self.state = "menu"
                 self.snake_game = None
+        elif self.state == "replay" and self.replay_playback:
+            self.replay_playback.advance(self.snake_game, self.clock.get_time())
+    
+    def current_scene(self):
+        """当前状态对应的场景对象"""
+        if self.state == "menu":
+            return self.main_menu
+        elif self.state in ["game", "replay"]:
+            return self.snake_game
+        elif self.state == "skin_selection":
+            return self.skin_selection_menu
+        return None
+    
+    def collect_dirty_rects(self):
+        """汇总本帧需要刷新的区域（None 表示整屏，空列表表示无变化）"""
+        scene = self.current_scene()
+        rects = scene.collect_dirty_rects() if scene else None
+        
+        # 场景切换、窗口尺寸变化、回放状态或叠加层变化时整屏刷新
+        frame_key = (self.state, id(scene), self.screen.get_size(), self.profiler.overlay_visible,
+                     self.replay_playback.finished if self.replay_playback else None)
+        if frame_key != self._drawn_frame_key:
+            self._drawn_frame_key = frame_key
+            return None
+        if self.profiler.overlay_visible and self.profiler.overlay_due():
+            return None
+        return rects
     
     def draw(self):
         """绘制游戏画面"""
+        rects = None
+        if self.dirty_rects:
+            rects = self.collect_dirty_rects()
+            if rects is not None and not rects:
+                return  # 画面无变化，跳过绘制与提交
+        
         self.screen.fill((26, 26, 46))  # 深蓝色背景
         
         if self.state == "menu":
             self.main_menu.draw()
-        elif self.state == "game" and self.snake_game:
+        elif self.state in ["game", "replay"] and self.snake_game:
             self.snake_game.draw()
+            if self.state == "replay":
+                self.draw_replay_label()
         elif self.state == "skin_selection":
             # 绘制皮肤选择界面
             self.skin_selection_menu.draw()
         
-        pygame.display.flip()
+        if self.profiler.overlay_visible:
+            self.profiler.draw_overlay(self.screen)
+        
+        if rects is None:
+            pygame.display.flip()
+        else:
+            pygame.display.update(rects)
+    
+    def draw_replay_label(self):
+        """绘制回放状态标签"""
+        speed_text = "极速" if self.replay_speed is None else f"{self.replay_speed:g}x"
+        status = "回放结束" if self.replay_playback.finished else "回放中"
+        label = render_text(self.snake_game.font, f"{status} {speed_text} | ESC返回", (255, 215, 0))
+        self.screen.blit(label, (10, self.screen.get_height() - 30))
+    
+    def export_profile(self):
+        """导出帧耗时记录（CSV 与 Chrome trace）"""
+        if not self.profiler.frame_count:
+            print("没有可导出的帧耗时记录（按F3开启）")
+            return
+        try:
+            filenames = self.profiler.export()
+            print(f"帧耗时记录已导出: {', '.join(filenames)}")
+        except Exception as e:
+            print(f"导出帧耗时记录失败: {e}")
+    
+    def run_profiled_frame(self):
+        """运行一帧并记录各阶段耗时"""
+        profiler = self.profiler
+        start = profiler.begin_frame()
+        self.handle_events()
+        start = profiler.record("events", start)
+        self.update()
+        start = profiler.record("update", start)
+        self.draw()
+        start = profiler.record("draw", start)
+        self.clock.tick(FPS)
+        profiler.record("tick", start)
+        profiler.end_frame()
     
     def run(self):
         """运行游戏主循环"""
         while self.running:
+            if self.profiler.enabled:
+                self.run_profiled_frame()
+                continue
             self.handle_events()
             self.update()
             self.draw()
             self.clock.tick(FPS)
         
+        # 退出时结束未完成的采集，保证结果写出
+        self.capture.stop()
+        # 写出尚未落盘的配置与分数日志
+        self.score_manager.close()
+        self.config_store.close()
+        self.replay_writer.close()
         pygame.quit()
         sys.exit()
 
+def parse_replay_speed(value):
+    """解析回放倍速参数（数字或 max）"""
+    if value == "max":
+        return None
+    speed = float(value)
+    if speed <= 0:
+        raise argparse.ArgumentTypeError("回放倍速必须大于0")
+    return speed
+
+def parse_grid_size(value):
+    """解析棋盘尺寸参数（例如 20x15、1000x1000）"""
+    try:
+        width, height = (int(part) for part in value.lower().split("x"))
+    except ValueError:
+        raise argparse.ArgumentTypeError("棋盘尺寸格式应为 宽x高，例如 40x30")
+    if not (2 <= width <= 65535 and 2 <= height <= 65535):
+        raise argparse.ArgumentTypeError("棋盘宽高必须在2到65535之间")
+    return width, height
+
 def main():
     """主函数"""
-    app = GameApp()
+    parser = argparse.ArgumentParser(description=TITLE)
+    parser.add_argument("--replay", metavar="FILE", help="播放回放文件")
+    parser.add_argument("--replay-speed", type=parse_replay_speed, default=1,
+                        help="回放倍速，例如 1、10，或 max（跳过渲染）")
+    parser.add_argument("--grid", type=parse_grid_size, default=(20, 15), metavar="WxH",
+                        help="棋盘尺寸，例如 40x30、1000x1000（默认20x15）")
+    parser.add_argument("--cell-size", type=int, default=None,
+                        help="格子像素大小（默认按窗口自动适配）")
+    parser.add_argument("--victory-length", type=int, default=300,
+                        help="胜利所需的蛇长度（不超过棋盘格子数）")
+    parser.add_argument("--profile", action="store_true",
+                        help="启动时即记录帧耗时（F3显示叠加层，F4导出）")
+    parser.add_argument("--dirty-rects", action="store_true",
+                        help="脏矩形模式：只刷新变化的区域（适合低功耗设备）")
+    parser.add_argument("--score-backend", choices=SCORE_BACKENDS, default="json",
+                        help="分数存储：json（scores.jsonl 日志）或 sqlite（scores.db，支持排名与统计查询）")
+    args = parser.parse_args()
+    
+    app = GameApp(replay_file=args.replay, replay_speed=args.replay_speed, grid_size=args.grid,
+                  cell_size=args.cell_size, victory_length=args.victory_length, profile=args.profile,
+                  dirty_rects=args.dirty_rects, score_backend=args.score_backend)
     app.run()
 
 if __name__ == "__main__":
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+帧耗时分析模块
+按阶段（事件、更新、绘制、帧等待）记录每帧耗时到固定大小的环形缓冲区，
+支持屏幕叠加显示百分位统计，并导出CSV与Chrome trace（chrome://tracing）格式
+"""
+
+import csv
+import json
+import os
+import time
+from array import array
+from datetime import datetime
+from stats_util import percentile
+
+PHASES = ("events", "update", "draw", "tick")
+
+class FrameProfiler:
+    """分阶段帧耗时分析器（未启用时主循环只多一次属性判断）"""
+    
+    def __init__(self, capacity=600, target_fps=60, phases=PHASES):
+        """初始化分析器（capacity 为保留的最近帧数）"""
+        self.capacity = capacity
+        self.phases = phases
+        self.enabled = False
+        self.overlay_visible = False
+        # 记录是否由叠加层开启（隐藏叠加层时随之关闭，--profile 开启的记录保持不变）
+        self._enabled_by_overlay = False
+        
+        # 掉帧判定：整帧耗时超过目标帧间隔的1.5倍
+        self.frame_budget_ns = 1_000_000_000 // target_fps
+        self.drop_threshold_ns = self.frame_budget_ns * 3 // 2
+        
+        # 每个阶段两个环形缓冲区：开始时间与耗时（纳秒）
+        self.starts = {phase: array('q', bytes(8 * capacity)) for phase in phases}
+        self.durations = {phase: array('q', bytes(8 * capacity)) for phase in phases}
+        self.frame_starts = array('q', bytes(8 * capacity))
+        self.frame_durations = array('q', bytes(8 * capacity))
+        
+        # 叠加层每隔若干帧才重新统计与渲染
+        self.overlay_interval = 30
+        self._overlay_surface = None
+        self._overlay_font = None
+        
+        self.clear()
+    
+    def clear(self):
+        """清空已记录的数据"""
+        self.frame_count = 0
+        self.dropped_frames = 0
+        self._slot = 0
+        self._frame_start = 0
+        self._overlay_surface = None
+    
+    def set_enabled(self, enabled):
+        """开启或关闭记录（重新开启时清空旧数据）"""
+        if enabled and not self.enabled:
+            self.clear()
+        self.enabled = enabled
+    
+    def toggle_overlay(self):
+        """切换叠加层（显示叠加层时自动开启记录，隐藏时关闭由叠加层开启的记录）"""
+        self.overlay_visible = not self.overlay_visible
+        if self.overlay_visible:
+            self._enabled_by_overlay = not self.enabled
+            self.set_enabled(True)
+        elif self._enabled_by_overlay:
+            self._enabled_by_overlay = False
+            self.set_enabled(False)
+        return self.overlay_visible
+    
+    def begin_frame(self):
+        """开始一帧，返回开始时间（用作第一个阶段的起点）"""
+        self._slot = self.frame_count % self.capacity
+        self._frame_start = time.perf_counter_ns()
+        return self._frame_start
+    
+    def record(self, phase, start):
+        """记录阶段从 start 到现在的耗时，返回当前时间（用作下一阶段的起点）"""
+        now = time.perf_counter_ns()
+        self.starts[phase][self._slot] = start
+        self.durations[phase][self._slot] = now - start
+        return now
+    
+    def end_frame(self):
+        """结束一帧"""
+        duration = time.perf_counter_ns() - self._frame_start
+        self.frame_starts[self._slot] = self._frame_start
+        self.frame_durations[self._slot] = duration
+        if duration > self.drop_threshold_ns:
+            self.dropped_frames += 1
+        self.frame_count += 1
+    
+    def _recent_slots(self):
+        """按时间顺序返回缓冲区中有效帧的下标"""
+        count = min(self.frame_count, self.capacity)
+        first = self.frame_count - count
+        return [(first + i) % self.capacity for i in range(count)]
+    
+    def get_stats(self):
+        """统计最近各帧每个阶段的 p50/p95/p99（毫秒）"""
+        slots = self._recent_slots()
+        stats = {}
+        for phase in self.phases + ("frame",):
+            buffer = self.frame_durations if phase == "frame" else self.durations[phase]
+            values = sorted(buffer[slot] for slot in slots)
+            stats[phase] = {
+                "p50": percentile(values, 0.50) / 1e6,
+                "p95": percentile(values, 0.95) / 1e6,
+                "p99": percentile(values, 0.99) / 1e6
+            }
+        
+        window_dropped = sum(1 for slot in slots if self.frame_durations[slot] > self.drop_threshold_ns)
+        stats["frames"] = len(slots)
+        stats["dropped_recent"] = window_dropped
+        stats["dropped_total"] = self.dropped_frames
+        return stats
+    
+    def overlay_due(self):
+        """本帧是否需要重新渲染叠加层"""
+        return self._overlay_surface is None or self.frame_count % self.overlay_interval == 0
+    
+    def draw_overlay(self, screen):
+        """在屏幕右上角绘制统计叠加层"""
+        if self.overlay_due():
+            self._overlay_surface = self._render_overlay()
+        screen.blit(self._overlay_surface, (screen.get_width() - self._overlay_surface.get_width() - 10, 40))
+    
+    def _render_overlay(self):
+        """渲染叠加层表面"""
+        import pygame
+        if self._overlay_font is None:
+            self._overlay_font = pygame.font.Font(None, 20)
+        
+        stats = self.get_stats()
+        lines = [f"{'phase':<7} {'p50':>6} {'p95':>6} {'p99':>6} ms"]
+        for phase in self.phases + ("frame",):
+            values = stats[phase]
+            lines.append(f"{phase:<7} {values['p50']:>6.2f} {values['p95']:>6.2f} {values['p99']:>6.2f}")
+        lines.append(f"dropped {stats['dropped_recent']}/{stats['frames']} (total {stats['dropped_total']})")
+        
+        line_height = self._overlay_font.get_linesize()
+        rendered = [self._overlay_font.render(line, True, (200, 255, 200)) for line in lines]
+        width = max(surface.get_width() for surface in rendered) + 12
+        surface = pygame.Surface((width, line_height * len(lines) + 8), pygame.SRCALPHA)
+        surface.fill((0, 0, 0, 180))
+        for i, line_surface in enumerate(rendered):
+            surface.blit(line_surface, (6, 4 + i * line_height))
+        return surface
+    
+    def export_csv(self, filename):
+        """导出每帧各阶段耗时（毫秒）为CSV"""
+        with open(filename, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(["frame", "start_ms"] + [f"{phase}_ms" for phase in self.phases] + ["frame_ms"])
+            first = self.frame_count - min(self.frame_count, self.capacity)
+            for i, slot in enumerate(self._recent_slots()):
+                row = [first + i, round(self.frame_starts[slot] / 1e6, 3)]
+                row += [round(self.durations[phase][slot] / 1e6, 3) for phase in self.phases]
+                row.append(round(self.frame_durations[slot] / 1e6, 3))
+                writer.writerow(row)
+    
+    def export_chrome_trace(self, filename):
+        """导出为Chrome trace-event JSON（可在 chrome://tracing 或 Perfetto 中打开）"""
+        events = []
+        for slot in self._recent_slots():
+            events.append({"name": "frame", "ph": "X", "pid": 1, "tid": 1,
+                           "ts": self.frame_starts[slot] / 1000, "dur": self.frame_durations[slot] / 1000})
+            for phase in self.phases:
+                events.append({"name": phase, "ph": "X", "pid": 1, "tid": 1,
+                               "ts": self.starts[phase][slot] / 1000,
+                               "dur": self.durations[phase][slot] / 1000})
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+    
+    def export(self, directory="profiles"):
+        """同时导出CSV与trace文件，返回文件名列表"""
+        os.makedirs(directory, exist_ok=True)
+        base = os.path.join(directory, f"frames_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+        self.export_csv(base + ".csv")
+        self.export_chrome_trace(base + ".trace.json")
+        return [base + ".csv", base + ".trace.json"]
\ No newline at end of file
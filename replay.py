@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+回放模块
+以 种子 + 每步输入 的紧凑二进制格式记录对局，并支持流式解码与快进回放；
+游戏中的回放由后台线程写盘，目录中只保留最近的若干个回放文件
+
+文件格式（小端序）:
+    文件头: 魔数 b"SNKR" | 版本 u8 | 网格宽 u16 | 网格高 u16 | 种子 u64 | 胜利长度 u32（版本2起）
+    数据段: 若干条 [输入字节 u8][重复次数 varint]
+    输入字节: 低2位为方向编号（上/下/左/右），第2位为加速键状态
+"""
+
+import os
+import struct
+import threading
+from datetime import datetime
+from game_core import Direction, GameState
+
+REPLAY_MAGIC = b"SNKR"
+REPLAY_VERSION = 2
+HEADER_FORMAT = "<4sBHHQ"
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+VICTORY_FORMAT = "<I"
+VICTORY_SIZE = struct.calcsize(VICTORY_FORMAT)
+DEFAULT_VICTORY_LENGTH = 300  # 版本1文件固定为300
+MAX_REPLAYS = 100  # 回放目录中保留的回放文件数
+
+DIRECTIONS = list(Direction)
+DIRECTION_CODES = {direction: code for code, direction in enumerate(DIRECTIONS)}
+ACCELERATING_FLAG = 0x04
+
+class ReplayError(Exception):
+    """回放文件格式错误"""
+
+def _encode_varint(value):
+    """将非负整数编码为varint字节串"""
+    data = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            data.append(byte | 0x80)
+        else:
+            data.append(byte)
+            return bytes(data)
+
+class ReplayRecorder:
+    """对局录制器（相同输入连续出现时合并为一条记录）"""
+    
+    def __init__(self, grid_width, grid_height, seed, victory_length=DEFAULT_VICTORY_LENGTH):
+        """初始化录制器"""
+        self.grid_width = grid_width
+        self.grid_height = grid_height
+        self.seed = seed
+        self.victory_length = victory_length
+        self.data = bytearray()
+        self.tick_count = 0
+        self._last_input = None
+        self._run_length = 0
+    
+    def record(self, direction, accelerating):
+        """记录一个逻辑步的输入"""
+        code = DIRECTION_CODES[direction] | (ACCELERATING_FLAG if accelerating else 0)
+        if code == self._last_input:
+            self._run_length += 1
+        else:
+            self._flush_run()
+            self._last_input = code
+            self._run_length = 1
+        self.tick_count += 1
+    
+    def _flush_run(self):
+        """写出当前累积的输入记录"""
+        if self._run_length:
+            self.data.append(self._last_input)
+            self.data += _encode_varint(self._run_length)
+            self._run_length = 0
+    
+    def to_bytes(self):
+        """生成完整的回放字节串"""
+        header = struct.pack(HEADER_FORMAT, REPLAY_MAGIC, REPLAY_VERSION,
+                             self.grid_width, self.grid_height, self.seed)
+        header += struct.pack(VICTORY_FORMAT, self.victory_length)
+        tail = bytearray()
+        if self._run_length:
+            tail.append(self._last_input)
+            tail += _encode_varint(self._run_length)
+        return header + bytes(self.data) + bytes(tail)
+    
+    def save(self, filename):
+        """保存回放文件"""
+        directory = os.path.dirname(filename)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(filename, 'wb') as f:
+            f.write(self.to_bytes())
+        return filename
+
+class ReplayReader:
+    """回放读取器（按块流式解码，不一次读入整个文件）"""
+    
+    def __init__(self, filename, chunk_size=4096):
+        """读取并校验文件头"""
+        self.filename = filename
+        self.chunk_size = chunk_size
+        with open(filename, 'rb') as f:
+            header = f.read(HEADER_SIZE + VICTORY_SIZE)
+        if len(header) < HEADER_SIZE:
+            raise ReplayError(f"回放文件过短: {filename}")
+        
+        magic, version, width, height, seed = struct.unpack(HEADER_FORMAT, header[:HEADER_SIZE])
+        if magic != REPLAY_MAGIC:
+            raise ReplayError(f"不是回放文件: {filename}")
+        if version not in (1, REPLAY_VERSION):
+            raise ReplayError(f"不支持的回放版本: {version}")
+        
+        self.data_offset = HEADER_SIZE
+        self.victory_length = DEFAULT_VICTORY_LENGTH
+        if version >= 2:
+            if len(header) < HEADER_SIZE + VICTORY_SIZE:
+                raise ReplayError(f"回放文件过短: {filename}")
+            self.victory_length, = struct.unpack(VICTORY_FORMAT, header[HEADER_SIZE:])
+            self.data_offset += VICTORY_SIZE
+        
+        self.version = version
+        self.grid_width = width
+        self.grid_height = height
+        self.seed = seed
+    
+    def _iter_bytes(self):
+        """逐字节读取数据段"""
+        with open(self.filename, 'rb') as f:
+            f.seek(self.data_offset)
+            while True:
+                chunk = f.read(self.chunk_size)
+                if not chunk:
+                    return
+                yield from chunk
+    
+    def iter_runs(self):
+        """逐条产生 (方向, 是否加速, 重复次数)"""
+        stream = self._iter_bytes()
+        for code in stream:
+            run_length = 0
+            shift = 0
+            for byte in stream:
+                run_length |= (byte & 0x7F) << shift
+                shift += 7
+                if not byte & 0x80:
+                    break
+            else:
+                raise ReplayError(f"回放数据被截断: {self.filename}")
+            yield DIRECTIONS[code & 0x03], bool(code & ACCELERATING_FLAG), run_length
+    
+    def iter_steps(self):
+        """逐步产生 (方向, 是否加速)"""
+        for direction, accelerating, run_length in self.iter_runs():
+            for _ in range(run_length):
+                yield direction, accelerating
+
+class ReplayPlayback:
+    """回放播放器：按指定倍速把记录的输入送入 SnakeGame"""
+    
+    def __init__(self, reader, speed=1):
+        """初始化播放器（speed 为倍数，None 表示不限速）"""
+        self.reader = reader
+        self.speed = speed
+        self.steps = reader.iter_steps()
+        self.pending_step = None
+        self.time_budget = 0
+        self.finished = False
+    
+    def _next_step(self):
+        """取出下一步输入，回放结束时返回None"""
+        if self.pending_step is None:
+            self.pending_step = next(self.steps, None)
+            if self.pending_step is None:
+                self.finished = True
+        return self.pending_step
+    
+    def _apply_step(self, game):
+        """执行一步并推进游戏时钟"""
+        direction, accelerating = self.pending_step
+        self.pending_step = None
+        delay = game.fast_move_delay if accelerating else game.base_move_delay
+        game.clock.advance(delay)
+        game.advance(direction, accelerating)
+        if game.state != GameState.PLAYING:
+            self.finished = True
+    
+    def advance(self, game, elapsed_ms):
+        """按经过的真实时间推进回放"""
+        if self.finished:
+            return
+        if self.speed is None:
+            self.run_to_end(game)
+            return
+        self.time_budget += elapsed_ms * self.speed
+        while self._next_step() is not None:
+            direction, accelerating = self.pending_step
+            delay = game.fast_move_delay if accelerating else game.base_move_delay
+            if self.time_budget < delay:
+                break
+            self.time_budget -= delay
+            self._apply_step(game)
+            if self.finished:
+                break
+    
+    def run_to_end(self, game):
+        """跳过渲染，直接执行完所有记录的输入"""
+        while not self.finished and self._next_step() is not None:
+            self._apply_step(game)
+
+def make_replay_filename(directory="replays"):
+    """生成带时间戳的回放文件名"""
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+    return os.path.join(directory, f"replay_{timestamp}.snkr")
+
+class ReplayWriter:
+    """后台回放写盘（游戏线程只生成字节串，写文件与清理旧回放在后台线程完成）"""
+    
+    def __init__(self, directory="replays", max_replays=MAX_REPLAYS):
+        """初始化写盘器（max_replays 为None时不清理旧回放）"""
+        self.directory = directory
+        self.max_replays = max_replays
+        
+        self._cond = threading.Condition()
+        self._pending = []
+        self._closed = False
+        self._thread = None
+    
+    def submit(self, recorder):
+        """提交一局录制，返回将要写入的文件名"""
+        filename = make_replay_filename(self.directory)
+        data = recorder.to_bytes()
+        with self._cond:
+            if self._closed:
+                raise ReplayError("回放写盘器已关闭")
+            self._pending.append((filename, data))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._writer_loop, name="replay-writer", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+        return filename
+    
+    def _writer_loop(self):
+        """后台写盘线程：依次写出待保存的回放，关闭后写完剩余的回放再退出"""
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if not self._pending:
+                    return
+                filename, data = self._pending.pop(0)
+            self._write(filename, data)
+    
+    def _write(self, filename, data):
+        """写入临时文件后重命名，再清理超出数量的旧回放"""
+        temp_file = filename + ".tmp"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(temp_file, 'wb') as f:
+                f.write(data)
+            os.replace(temp_file, filename)
+            self.prune()
+        except Exception as e:
+            print(f"保存回放失败: {e}")
+    
+    def prune(self):
+        """只保留最近的 max_replays 个回放文件（文件名中的时间戳按字典序即时间顺序）"""
+        if self.max_replays is None:
+            return
+        replays = sorted(name for name in os.listdir(self.directory)
+                         if name.startswith("replay_") and name.endswith(".snkr"))
+        for name in replays[:max(0, len(replays) - self.max_replays)]:
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError as e:
+                print(f"删除旧回放失败: {e}")
+    
+    def close(self):
+        """写完所有待保存的回放并停止后台线程（退出前调用）"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout=5)
@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+分数档案导入导出模块
+多个档案（export_scores 导出的JSON、JSONL、scores.jsonl 日志）由工作进程池并行增量解析，
+各自整理为按 (时间戳, 分数) 排序的临时文件，再用 heapq.merge 多路归并，
+归并时一次遍历按 (分数, 时间戳) 去重；导出时逐条写出，不在内存中拼出整个文档
+
+用法:
+    python score_archive.py import kiosk1/score_export.json kiosk2/scores.jsonl --workers 8
+    python score_archive.py export archive.jsonl
+"""
+
+import argparse
+import heapq
+import json
+import os
+import shutil
+import sys
+import tempfile
+from multiprocessing import Pool
+
+CHUNK_SIZE = 1 << 16
+PROGRESS_INTERVAL = 10000
+_WHITESPACE = " \t\r\n"
+_decoder = json.JSONDecoder()
+
+class _StreamReader:
+    """按块读取文本，用 raw_decode 逐个解析JSON值"""
+    
+    def __init__(self, f):
+        """包装已打开的文本文件"""
+        self.f = f
+        self.buffer = ""
+        self.pos = 0
+    
+    def _fill(self):
+        """读入下一块（丢弃已解析的部分），文件结束时返回False"""
+        chunk = self.f.read(CHUNK_SIZE)
+        if not chunk:
+            return False
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+    
+    def peek(self):
+        """跳过空白并返回下一个字符（文件结束时返回空串）"""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return ""
+    
+    def expect(self, char):
+        """读取一个指定的分隔符"""
+        if self.peek() != char:
+            raise ValueError(f"档案格式错误：位置 {self.pos} 处应为 {char!r}")
+        self.pos += 1
+    
+    def decode(self):
+        """解析下一个JSON值（值被块边界截断时读入更多内容后重试）"""
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            if end == len(self.buffer) and self._fill():
+                continue  # 数字可能被截断，读入更多后重新解析
+            self.pos = end
+            return value
+
+class ArchiveReader:
+    """增量读取分数档案中的记录（.jsonl 按行读取，其余按 export_scores 的JSON格式读取）"""
+    
+    def __init__(self, filename):
+        """初始化读取器"""
+        self.filename = filename
+        self.high_score = 0
+    
+    def __iter__(self):
+        """逐条产生记录"""
+        if self.filename.endswith(".jsonl"):
+            return self._iter_lines()
+        return self._iter_object()
+    
+    def _iter_lines(self):
+        """JSONL：每行一条记录（跳过 scores.jsonl 的快照头）"""
+        with open(self.filename, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # 中断写入留下的半行
+                if not isinstance(entry, dict):
+                    continue
+                if 'score' not in entry:
+                    self.high_score = max(self.high_score, entry.get('high_score', 0))
+                    continue
+                yield entry
+    
+    def _iter_object(self):
+        """JSON对象：逐个解析顶层键，score_history 数组逐个元素产生"""
+        with open(self.filename, 'r', encoding='utf-8') as f:
+            reader = _StreamReader(f)
+            reader.expect("{")
+            found_history = False
+            while reader.peek() != "}":
+                key = reader.decode()
+                reader.expect(":")
+                if key == 'score_history':
+                    found_history = True
+                    reader.expect("[")
+                    while reader.peek() != "]":
+                        yield reader.decode()
+                        if reader.peek() == ",":
+                            reader.expect(",")
+                    reader.expect("]")
+                else:
+                    value = reader.decode()
+                    if key == 'high_score':
+                        self.high_score = max(self.high_score, value)
+                if reader.peek() == ",":
+                    reader.expect(",")
+            if not found_history:
+                raise ValueError("档案中没有 score_history")
+
+def _sort_key(entry):
+    """归并顺序"""
+    return (entry['timestamp'], entry['score'])
+
+def _prepare_run(task):
+    """工作进程：把一个档案整理为排好序的JSONL临时文件"""
+    filename, run_file = task
+    result = {"filename": filename, "run_file": run_file, "count": 0, "high_score": 0, "error": None}
+    try:
+        reader = ArchiveReader(filename)
+        is_sorted = True
+        previous = None
+        high_score = 0
+        with open(run_file, 'w', encoding='utf-8') as out:
+            for entry in reader:
+                if not isinstance(entry, dict) or 'score' not in entry or 'timestamp' not in entry:
+                    continue
+                key = _sort_key(entry)
+                if previous is not None and key < previous:
+                    is_sorted = False
+                previous = key
+                high_score = max(high_score, entry['score'])
+                out.write(json.dumps(entry, ensure_ascii=False) + "\n")
+                result["count"] += 1
+        
+        if not is_sorted:
+            # 未排序的档案在本进程内排序一次
+            entries = list(_iter_run(run_file))
+            entries.sort(key=_sort_key)
+            with open(run_file, 'w', encoding='utf-8') as out:
+                for entry in entries:
+                    out.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        result["high_score"] = max(high_score, reader.high_score)
+    except Exception as e:
+        result["error"] = str(e)
+    return result
+
+def _iter_run(run_file):
+    """逐条读取整理好的临时文件"""
+    with open(run_file, 'r', encoding='utf-8') as f:
+        for line in f:
+            yield json.loads(line)
+
+def prepare_runs(filenames, work_dir, workers=None, progress=None):
+    """用进程池并行整理各档案，返回每个档案的结果（progress(阶段, 已完成, 总数) 报告进度）"""
+    tasks = [(filename, os.path.join(work_dir, f"run_{i}.jsonl")) for i, filename in enumerate(filenames)]
+    workers = min(workers or os.cpu_count() or 1, len(tasks))
+    results = []
+    
+    def collect(result):
+        if result["error"]:
+            print(f"读取分数档案失败 {result['filename']}: {result['error']}")
+        results.append(result)
+        if progress:
+            progress("parse", len(results), len(tasks))
+    
+    if workers > 1:
+        with Pool(workers) as pool:
+            for result in pool.imap_unordered(_prepare_run, tasks):
+                collect(result)
+    else:
+        for task in tasks:
+            collect(_prepare_run(task))
+    return results
+
+def merge_runs(run_files, progress=None, total=None):
+    """多路归并已排序的临时文件，一次遍历去重（相同时间戳的记录相邻，只需记住当前时间戳的键）"""
+    current_timestamp = None
+    seen = set()
+    merged = 0
+    for entry in heapq.merge(*(_iter_run(run_file) for run_file in run_files), key=_sort_key):
+        merged += 1
+        if progress and merged % PROGRESS_INTERVAL == 0:
+            progress("merge", merged, total)
+        
+        if entry['timestamp'] != current_timestamp:
+            current_timestamp = entry['timestamp']
+            seen.clear()
+        key = (entry['score'], entry['timestamp'])
+        if key in seen:
+            continue
+        seen.add(key)
+        yield entry
+    
+    if progress:
+        progress("merge", merged, total)
+
+class ArchiveMerge:
+    """整理并归并多个档案（with 语句结束时删除临时文件）"""
+    
+    def __init__(self, filenames, workers=None, progress=None):
+        """初始化（workers 为None时使用CPU核心数）"""
+        self.filenames = list(filenames)
+        self.workers = workers
+        self.progress = progress
+        self.results = []
+        self.high_score = 0
+        self.total = 0
+        self.work_dir = None
+    
+    def __enter__(self):
+        """并行整理全部档案"""
+        self.work_dir = tempfile.mkdtemp(prefix="snake_scores_")
+        self.results = prepare_runs(self.filenames, self.work_dir, self.workers, self.progress)
+        valid = [result for result in self.results if not result["error"]]
+        self.high_score = max((result["high_score"] for result in valid), default=0)
+        self.total = sum(result["count"] for result in valid)
+        return self
+    
+    def valid_files(self):
+        """成功读取的档案"""
+        return [result["filename"] for result in self.results if not result["error"]]
+    
+    def __iter__(self):
+        """按时间顺序产生去重后的记录"""
+        run_files = [result["run_file"] for result in self.results if not result["error"]]
+        return merge_runs(run_files, self.progress, self.total)
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        """删除临时文件"""
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+        return False
+
+def write_export(filename, summary, entries):
+    """逐条写出导出文件（.jsonl 每行一条记录，其余为带汇总字段的JSON对象）"""
+    temp_file = filename + ".tmp"
+    count = 0
+    with open(temp_file, 'w', encoding='utf-8') as f:
+        if filename.endswith(".jsonl"):
+            for entry in entries:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+                count += 1
+        else:
+            f.write("{\n")
+            for key, value in summary.items():
+                f.write(f"  {json.dumps(key)}: {json.dumps(value, ensure_ascii=False)},\n")
+            f.write('  "score_history": [')
+            for entry in entries:
+                f.write(",\n    " if count else "\n    ")
+                f.write(json.dumps(entry, ensure_ascii=False))
+                count += 1
+            f.write("\n  ]\n}\n" if count else "]\n}\n")
+    os.replace(temp_file, filename)
+    return count
+
+def print_progress(stage, done, total):
+    """命令行进度输出"""
+    label = "解析档案" if stage == "parse" else "归并记录"
+    print(f"{label}: {done}/{total}", file=sys.stderr)
+
+def main():
+    """命令行入口"""
+    from score_manager import ScoreManager, SCORE_BACKENDS
+    
+    parser = argparse.ArgumentParser(description="分数档案导入导出（并行解析、多路归并去重）")
+    parser.add_argument("action", choices=["import", "export"], help="导入档案或导出当前记录")
+    parser.add_argument("files", nargs="+", help="导入时为档案文件列表，导出时为输出文件（.json 或 .jsonl）")
+    parser.add_argument("--config", default="config.json", help="配置文件（分数文件位于同一目录）")
+    parser.add_argument("--backend", choices=SCORE_BACKENDS, default="json", help="分数存储后端")
+    parser.add_argument("--workers", type=int, default=None, help="解析档案的工作进程数（默认CPU核心数）")
+    parser.add_argument("--history-limit", type=int, default=100, help="保留的历史记录条数（0表示不限）")
+    args = parser.parse_args()
+    
+    score_manager = ScoreManager(args.config, history_limit=args.history_limit or None, backend=args.backend)
+    try:
+        if args.action == "import":
+            ok = score_manager.import_scores(args.files, workers=args.workers, progress=print_progress)
+            print(f"导入{'完成' if ok else '失败'}: 共 {score_manager.get_total_games()} 条记录，最高分 {score_manager.high_score}")
+        else:
+            ok = score_manager.export_scores(args.files[0])
+            print(f"导出{'完成' if ok else '失败'}: {args.files[0]}")
+    finally:
+        score_manager.close()
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
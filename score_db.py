@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+SQLite分数存储模块
+ScoreManager 的可选后端：分数记录存在 scores 表（score、timestamp 建索引，可选 profile 与 skin 列），
+另由触发器维护按分数计数的 score_counts 表，排名与百分位只需扫描不同分值（每次 O(不同分值数)）而不是全部记录；
+最高分与迁移标记等单值保存在 meta 表中（最高分可能来自已不在历史记录中的旧纪录）
+"""
+
+import math
+import sqlite3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scores (
+    id INTEGER PRIMARY KEY,
+    score INTEGER NOT NULL,
+    timestamp TEXT NOT NULL,
+    is_record INTEGER NOT NULL DEFAULT 0,
+    profile TEXT,
+    skin TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_scores_score ON scores (score, timestamp);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_scores_timestamp ON scores (timestamp, score);
+CREATE INDEX IF NOT EXISTS idx_scores_record ON scores (is_record) WHERE is_record = 1;
+
+CREATE TABLE IF NOT EXISTS score_counts (
+    score INTEGER PRIMARY KEY,
+    count INTEGER NOT NULL
+) WITHOUT ROWID;
+
+CREATE TRIGGER IF NOT EXISTS scores_count_insert AFTER INSERT ON scores BEGIN
+    INSERT INTO score_counts (score, count) VALUES (NEW.score, 1)
+        ON CONFLICT (score) DO UPDATE SET count = count + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS scores_count_delete AFTER DELETE ON scores BEGIN
+    UPDATE score_counts SET count = count - 1 WHERE score = OLD.score;
+    DELETE FROM score_counts WHERE score = OLD.score AND count <= 0;
+END;
+
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value
+) WITHOUT ROWID;
+"""
+
+COLUMNS = "score, timestamp, is_record, profile, skin"
+
+def _row_to_entry(row):
+    """把查询结果转换为与JSON存储相同格式的记录"""
+    entry = {'score': row[0], 'timestamp': row[1], 'is_record': bool(row[2])}
+    if row[3] is not None:
+        entry['profile'] = row[3]
+    if row[4] is not None:
+        entry['skin'] = row[4]
+    return entry
+
+class ScoreDatabase:
+    """基于SQLite的分数存储"""
+    
+    def __init__(self, filename="scores.db"):
+        """打开（必要时创建）数据库"""
+        self.filename = filename
+        self.conn = sqlite3.connect(filename)
+        # WAL 模式下提交不必每次等待 fsync，游戏结束时写入不会卡顿
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self.conn.commit()
+    
+    def add_score(self, score, timestamp, is_record=False, profile=None, skin=None):
+        """添加一条分数记录（相同时间戳与分数的记录视为重复，返回是否插入）"""
+        with self.conn:
+            cursor = self.conn.execute(
+                f"INSERT OR IGNORE INTO scores ({COLUMNS}) VALUES (?, ?, ?, ?, ?)",
+                (score, timestamp, int(is_record), profile, skin))
+        return cursor.rowcount > 0
+    
+    def add_entries(self, entries):
+        """批量添加记录（格式同JSON存储），返回实际插入的条数"""
+        before = self.get_total_games()
+        with self.conn:
+            self.conn.executemany(
+                f"INSERT OR IGNORE INTO scores ({COLUMNS}) VALUES (?, ?, ?, ?, ?)",
+                ((entry['score'], entry['timestamp'], int(entry.get('is_record', False)),
+                  entry.get('profile'), entry.get('skin')) for entry in entries))
+        return self.get_total_games() - before
+    
+    def clear(self):
+        """删除所有记录并把最高分归零（迁移标记保持不变）"""
+        with self.conn:
+            self.conn.execute("DELETE FROM scores")
+            self.conn.execute("DELETE FROM score_counts")
+            self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('high_score', 0)")
+    
+    def get_meta(self, key, default=None):
+        """读取 meta 表中的单值"""
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return default if row is None else row[0]
+    
+    def set_meta(self, key, value):
+        """写入 meta 表中的单值"""
+        with self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+    
+    def close(self):
+        """关闭数据库"""
+        self.conn.close()
+    
+    def _where(self, start=None, end=None, profile=None, skin=None):
+        """生成时间窗口与 profile/skin 过滤条件"""
+        clauses = []
+        params = []
+        if start is not None:
+            clauses.append("timestamp >= ?")
+            params.append(start)
+        if end is not None:
+            clauses.append("timestamp < ?")
+            params.append(end)
+        if profile is not None:
+            clauses.append("profile = ?")
+            params.append(profile)
+        if skin is not None:
+            clauses.append("skin = ?")
+            params.append(skin)
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+    
+    def get_high_score(self):
+        """最高分（取 meta 中保存的最高分，没有时取记录中的最大值）"""
+        high_score = self.get_meta('high_score')
+        if high_score is not None:
+            return high_score
+        row = self.conn.execute("SELECT MAX(score) FROM score_counts").fetchone()
+        return row[0] or 0
+    
+    def set_high_score(self, high_score):
+        """保存最高分"""
+        self.set_meta('high_score', high_score)
+    
+    def get_total_games(self):
+        """总游戏次数"""
+        row = self.conn.execute("SELECT SUM(count) FROM score_counts").fetchone()
+        return row[0] or 0
+    
+    def get_average_score(self):
+        """全部记录的平均分（由 score_counts 计算）"""
+        total, score_sum = self.conn.execute("SELECT SUM(count), SUM(score * count) FROM score_counts").fetchone()
+        return score_sum / total if total else 0
+    
+    def get_records_count(self):
+        """破纪录次数（部分索引只包含破纪录的记录）"""
+        row = self.conn.execute("SELECT COUNT(*) FROM scores WHERE is_record = 1").fetchone()
+        return row[0]
+    
+    def get_recent(self, limit=10):
+        """最近的记录，按时间倒序"""
+        rows = self.conn.execute(
+            f"SELECT {COLUMNS} FROM scores ORDER BY timestamp DESC LIMIT ?", (limit,))
+        return [_row_to_entry(row) for row in rows]
+    
+    def get_top_scores(self, limit=10, start=None, end=None, profile=None, skin=None):
+        """分数最高的若干条记录（同分时较新的在前，可按时间窗口、profile、skin 过滤）"""
+        where, params = self._where(start, end, profile, skin)
+        rows = self.conn.execute(
+            f"SELECT {COLUMNS} FROM scores{where} ORDER BY score DESC, timestamp DESC LIMIT ?", params + [limit])
+        return [_row_to_entry(row) for row in rows]
+    
+    def get_rank(self, score):
+        """分数在全部记录中的排名（比它高的记录数 + 1，扫描 score_counts 中更高的分值，O(不同分值数)）"""
+        row = self.conn.execute("SELECT SUM(count) FROM score_counts WHERE score > ?", (score,)).fetchone()
+        return (row[0] or 0) + 1
+    
+    def get_percentile(self, fraction):
+        """最近秩法的百分位分数（与 stats_util.percentile 一致，按分值累加 score_counts，O(不同分值数)）"""
+        total = self.get_total_games()
+        if total == 0:
+            return 0
+        rank = min(total, max(1, math.ceil(fraction * total)))
+        row = self.conn.execute(
+            "SELECT score FROM (SELECT score, SUM(count) OVER (ORDER BY score) AS cumulative FROM score_counts) "
+            "WHERE cumulative >= ? LIMIT 1", (rank,)).fetchone()
+        return row[0]
+    
+    def get_histogram(self, bins=10):
+        """等宽直方图，返回 [(下界, 上界, 次数)]（区间为 [下界, 上界)，与 ScoreStats.histogram 一致）"""
+        low, high = self.conn.execute("SELECT MIN(score), MAX(score) FROM score_counts").fetchone()
+        if low is None:
+            return []
+        width = max(1, math.ceil((high - low + 1) / bins))
+        counts = dict(self.conn.execute(
+            "SELECT (score - ?) / ? AS bucket, SUM(count) FROM score_counts GROUP BY bucket", (low, width)))
+        used_bins = min(bins, (high - low) // width + 1)
+        return [(low + i * width, min(low + (i + 1) * width, high + 1), counts.get(i, 0)) for i in range(used_bins)]
+    
+    def get_window_statistics(self, start=None, end=None, profile=None, skin=None):
+        """时间窗口内的统计（时间戳为ISO格式字符串，区间为 [start, end)）"""
+        where, params = self._where(start, end, profile, skin)
+        row = self.conn.execute(
+            f"SELECT COUNT(*), AVG(score), MIN(score), MAX(score), SUM(is_record), MAX(timestamp) "
+            f"FROM scores{where}", params).fetchone()
+        return {
+            'total_games': row[0],
+            'average_score': round(row[1], 1) if row[1] is not None else 0,
+            'lowest_score': row[2] or 0,
+            'high_score': row[3] or 0,
+            'records_count': row[4] or 0,
+            'last_played': row[5]
+        }
+    
+    def get_statistics(self):
+        """全部记录的统计（由 score_counts 与索引计算）"""
+        total, score_sum, lowest, highest = self.conn.execute(
+            "SELECT SUM(count), SUM(score * count), MIN(score), MAX(score) FROM score_counts").fetchone()
+        last_played = self.conn.execute("SELECT MAX(timestamp) FROM scores").fetchone()[0]
+        if not total:
+            return None
+        return {
+            'total_games': total,
+            'average_score': round(score_sum / total, 1),
+            'lowest_score': lowest,
+            'high_score': highest,
+            'records_count': self.get_records_count(),
+            'last_played': last_played,
+            'score_range': highest - lowest
+        }
+    
+    def iter_entries(self, batch_size=1000):
+        """按时间顺序逐批读取全部记录"""
+        cursor = self.conn.execute(f"SELECT {COLUMNS} FROM scores ORDER BY timestamp, score")
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                return
+            for row in rows:
+                yield _row_to_entry(row)
\ No newline at end of file
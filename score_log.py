@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+分数日志模块
+每局结果作为一行JSON追加到日志文件末尾，文件开头是固定宽度的快照头（保存 high_score），
+刷新纪录时只原地改写快照头，因此每局的写入开销与历史记录数量无关；
+设置条数上限时，超出上限一倍后在后台线程中压缩日志，只保留最近的记录
+"""
+
+import json
+import os
+import threading
+from collections import deque
+
+LOG_FORMAT = "snake-score-log"
+LOG_VERSION = 1
+HEADER_SIZE = 128  # 快照头固定字节数（含换行）
+
+class ScoreLog:
+    """追加写入的分数日志（JSONL + 固定宽度快照头）"""
+    
+    def __init__(self, filename, max_entries=None):
+        """初始化日志（max_entries 为None时保留全部记录）"""
+        self.filename = os.path.abspath(filename)
+        self.max_entries = max_entries
+        self.high_score = 0
+        self.line_count = 0
+        self.compaction_count = 0
+        
+        # 设置上限时保留最近的原始行，压缩时直接写出
+        self._tail = deque(maxlen=max_entries) if max_entries else None
+        self._lock = threading.Lock()
+        self._file = None
+        self._compacting = False
+        self._appended_during_compaction = None
+        self._generation = 0  # 整体重写时递增，使进行中的压缩作废
+    
+    def exists(self):
+        """日志文件是否存在"""
+        return os.path.exists(self.filename)
+    
+    def _encode_header(self, high_score):
+        """生成固定宽度的快照头"""
+        header = json.dumps({"format": LOG_FORMAT, "version": LOG_VERSION, "high_score": high_score})
+        data = header.encode('utf-8')
+        if len(data) > HEADER_SIZE - 1:
+            raise ValueError("快照头超出固定长度")
+        return data.ljust(HEADER_SIZE - 1, b' ') + b'\n'
+    
+    def load(self, limit=None):
+        """读取日志，返回 (最高分, 记录列表)（limit 为最多返回的最近记录数）"""
+        records = deque(maxlen=limit)
+        self.high_score = 0
+        self.line_count = 0
+        if self._tail is not None:
+            self._tail.clear()
+        if not self.exists():
+            return 0, []
+        
+        try:
+            with open(self.filename, 'rb') as f:
+                header = json.loads(f.readline())
+                if header.get("format") != LOG_FORMAT:
+                    raise ValueError("不是分数日志文件")
+                self.high_score = header.get("high_score", 0)
+                
+                for line in f:
+                    if not line.endswith(b'\n'):
+                        break  # 上次写入中断留下的半行
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue
+                    records.append(record)
+                    self.line_count += 1
+                    if self._tail is not None:
+                        self._tail.append(line)
+        except Exception as e:
+            print(f"加载分数日志失败: {e}")
+        return self.high_score, list(records)
+    
+    def _open_for_append(self):
+        """打开追加句柄（文件末尾不是换行时先补齐，丢弃中断的半行）"""
+        if self._file is not None:
+            return self._file
+        if not self.exists():
+            self._write_file(self.high_score, [])
+        
+        self._file = open(self.filename, 'ab')
+        if self._file.tell() > HEADER_SIZE:
+            with open(self.filename, 'rb') as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b'\n':
+                    self._file.write(b'\n')
+        return self._file
+    
+    def append(self, record):
+        """追加一条记录"""
+        line = json.dumps(record, ensure_ascii=False).encode('utf-8') + b'\n'
+        try:
+            with self._lock:
+                f = self._open_for_append()
+                f.write(line)
+                f.flush()
+                self.line_count += 1
+                if self._tail is not None:
+                    self._tail.append(line)
+                if self._appended_during_compaction is not None:
+                    self._appended_during_compaction.append(line)
+                need_compaction = self._needs_compaction()
+        except Exception as e:
+            print(f"保存分数记录失败: {e}")
+            return
+        
+        if need_compaction:
+            self.compact_in_background()
+    
+    def set_high_score(self, high_score):
+        """原地改写快照头中的最高分"""
+        try:
+            with self._lock:
+                self.high_score = high_score
+                self._open_for_append().flush()
+                with open(self.filename, 'r+b') as f:
+                    f.write(self._encode_header(high_score))
+        except Exception as e:
+            print(f"保存最高分失败: {e}")
+    
+    def _needs_compaction(self):
+        """记录数超过上限一倍时需要压缩（调用方需持有锁）"""
+        return (self.max_entries is not None and not self._compacting
+                and self.line_count >= self.max_entries * 2)
+    
+    def compact_in_background(self):
+        """在后台线程中压缩日志，返回线程（已在压缩或无需压缩时返回None）"""
+        with self._lock:
+            if self._compacting or self._tail is None:
+                return None
+            self._compacting = True
+        thread = threading.Thread(target=self.compact, name="score-log-compaction", daemon=True)
+        thread.start()
+        return thread
+    
+    def compact(self):
+        """把日志重写为快照头 + 最近的记录，通过临时文件原子替换"""
+        with self._lock:
+            self._compacting = True
+            lines = list(self._tail) if self._tail is not None else None
+            high_score = self.high_score
+            end = os.path.getsize(self.filename) if self.exists() else 0
+            generation = self._generation
+            self._appended_during_compaction = []
+        
+        temp_file = self.filename + ".compact.tmp"
+        try:
+            if lines is None:
+                # 未设置上限时只清理中断的半行与无法解析的行
+                lines = []
+                if end > HEADER_SIZE:
+                    with open(self.filename, 'rb') as f:
+                        f.seek(HEADER_SIZE)
+                        data = f.read(end - HEADER_SIZE)
+                    for line in data.splitlines(keepends=True):
+                        if line.endswith(b'\n'):
+                            try:
+                                json.loads(line)
+                            except ValueError:
+                                continue
+                            lines.append(line)
+            
+            with open(temp_file, 'wb') as f:
+                f.write(self._encode_header(high_score))
+                f.writelines(lines)
+            
+            with self._lock:
+                if generation != self._generation:
+                    os.remove(temp_file)
+                    return
+                # 压缩期间追加的记录与更新的最高分一并写入，然后替换
+                pending = self._appended_during_compaction
+                with open(temp_file, 'r+b') as f:
+                    f.write(self._encode_header(self.high_score))
+                    f.seek(0, os.SEEK_END)
+                    f.writelines(pending)
+                    f.flush()
+                    os.fsync(f.fileno())
+                if self._file is not None:
+                    self._file.close()
+                    self._file = None
+                os.replace(temp_file, self.filename)
+                self.line_count = len(lines) + len(pending)
+                self.compaction_count += 1
+        except Exception as e:
+            print(f"压缩分数日志失败: {e}")
+        finally:
+            with self._lock:
+                self._compacting = False
+                self._appended_during_compaction = None
+    
+    def _write_file(self, high_score, lines):
+        """原子写出完整的日志文件（lines 可以是生成器，逐行写出），返回写出的行数"""
+        temp_file = self.filename + ".tmp"
+        os.makedirs(os.path.dirname(self.filename), exist_ok=True)
+        count = 0
+        with open(temp_file, 'wb') as f:
+            f.write(self._encode_header(high_score))
+            for line in lines:
+                f.write(line)
+                count += 1
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_file, self.filename)
+        return count
+    
+    def rewrite(self, high_score, records):
+        """用给定的最高分与记录整体重写日志（重置、导入时使用；records 可以是任意可迭代对象，逐条写出）"""
+        lines = (json.dumps(record, ensure_ascii=False).encode('utf-8') + b'\n' for record in records)
+        if self.max_entries is not None:
+            lines = deque(lines, maxlen=self.max_entries)
+        try:
+            with self._lock:
+                if self._file is not None:
+                    self._file.close()
+                    self._file = None
+                self.line_count = self._write_file(high_score, lines)
+                self._generation += 1
+                self.high_score = high_score
+                if self._tail is not None:
+                    self._tail = lines
+            return True
+        except Exception as e:
+            print(f"保存分数日志失败: {e}")
+            return False
+    
+    def close(self):
+        """关闭追加句柄"""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
\ No newline at end of file
@@ -2,49 +2,82 @@
 # -*- coding: utf-8 -*-
 """
 分数管理器模块
-处理最高分记录的读写和管理
+处理最高分记录的读写和管理（默认追加写入 scores.jsonl 日志，可选 SQLite 后端 scores.db）
 """
 
-import json
 import os
 from datetime import datetime
+from config_store import get_config_store
+from score_log import ScoreLog
+from score_db import ScoreDatabase
+from score_archive import ArchiveMerge, write_export
+from score_stats import ScoreStats
+
+SCORE_BACKENDS = ("json", "sqlite")
 
 class ScoreManager:
     """分数管理器类"""
     
-    def __init__(self, config_file="config.json"):
-        """初始化分数管理器"""
-        self.config_file = config_file
+    def __init__(self, config_file="config.json", config_store=None, history_limit=100, log_file=None,
+                 backend="json", db_file=None):
+        """初始化分数管理器
+        config_store 为None时使用 config_file 的共享存储；history_limit 为None时保留全部历史记录；
+        backend 为 "sqlite" 时记录保存在 db_file（默认为配置文件旁的 scores.db），
+        内存中只保留最近 history_limit 条；log_file 默认为配置文件旁的 scores.jsonl"""
+        if backend not in SCORE_BACKENDS:
+            raise ValueError(f"未知的分数存储后端: {backend}")
+        self.config_store = config_store or get_config_store(config_file)
+        self.config_file = self.config_store.config_file
+        self.history_limit = history_limit
+        data_dir = os.path.dirname(self.config_file)
+        self.score_log = ScoreLog(log_file or os.path.join(data_dir, "scores.jsonl"), history_limit)
+        self.score_db = None
+        if backend == "sqlite":
+            self.score_db = ScoreDatabase(db_file or os.path.join(data_dir, "scores.db"))
         self.high_score = 0
         self.score_history = []
+        # 内存中历史记录的增量统计（平均分、排名、百分位等不必每次重新扫描）
+        self.stats = ScoreStats()
         self.load_scores()
     
     def load_scores(self):
-        """从配置文件加载分数数据"""
-        try:
-            if os.path.exists(self.config_file):
-                with open(self.config_file, 'r', encoding='utf-8') as f:
-                    config = json.load(f)
-                    self.high_score = config.get('high_score', 0)
-                    self.score_history = config.get('score_history', [])
-                    
-                    # 确保分数历史不超过100条记录
-                    if len(self.score_history) > 100:
-                        self.score_history = self.score_history[-100:]
-            else:
-                # 如果配置文件不存在，创建默认配置
-                self.create_default_config()
-        except Exception as e:
-            print(f"加载分数数据失败: {e}")
-            self.high_score = 0
-            self.score_history = []
+        """从分数日志加载分数数据"""
+        if not self.config_store.loaded:
+            # 如果配置文件不存在或已损坏，创建默认配置
             self.create_default_config()
+        
+        if not self.score_log.exists():
+            self.migrate_config_scores()
+        
+        if self.score_db is not None:
+            self._load_from_db()
+            return
+        self.high_score, self.score_history = self.score_log.load(self.history_limit)
+        self.stats.rebuild(self.score_history)
+    
+    def _load_from_db(self):
+        """从SQLite加载最高分与最近的记录（首次使用时先导入JSON日志中的最高分与历史）"""
+        if not self.score_db.get_meta('migrated'):
+            high_score, entries = ScoreLog(self.score_log.filename).load()
+            if entries:
+                self.score_db.add_entries(entries)
+            self.score_db.set_high_score(max(high_score, self.score_db.get_high_score()))
+            self.score_db.set_meta('migrated', 1)
+        
+        self.high_score = self.score_db.get_high_score()
+        self.score_history = self.score_db.get_recent(self.history_limit or self.score_db.get_total_games())[::-1]
+        self.stats.rebuild(self.score_history)
+    
+    def migrate_config_scores(self):
+        """把旧版保存在 config.json 中的最高分与历史记录迁移到分数日志"""
+        high_score = self.config_store.get('high_score', 0)
+        score_history = self.config_store.get('score_history', [])
+        if self.score_log.rewrite(high_score, score_history):
+            self.config_store.remove('high_score', 'score_history', 'last_updated')
     
     def create_default_config(self):
-        """创建默认配置文件"""
+        """补齐默认配置项（已有的配置项保持不变）"""
         default_config = {
-            'high_score': 0,
-            'score_history': [],
             'current_skin': 'classic',
             'version': '1.0.0',
             'settings': {
@@ -54,39 +87,27 @@ class ScoreManager:
             }
         }
         
-        try:
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(default_config, f, ensure_ascii=False, indent=2)
-        except Exception as e:
-            print(f"创建默认配置文件失败: {e}")
+        for key, value in default_config.items():
+            self.config_store.setdefault(key, value)
     
     def save_scores(self):
-        """保存分数数据到配置文件"""
-        try:
-            # 读取现有配置
-            config = {}
-            if os.path.exists(self.config_file):
-                with open(self.config_file, 'r', encoding='utf-8') as f:
-                    config = json.load(f)
-            
-            # 更新分数相关数据
-            config['high_score'] = self.high_score
-            config['score_history'] = self.score_history
-            config['last_updated'] = datetime.now().isoformat()
-            
-            # 保存配置
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(config, f, ensure_ascii=False, indent=2)
-                
-        except Exception as e:
-            print(f"保存分数数据失败: {e}")
+        """用内存中的数据整体重写分数日志（重置、导入时使用，每局结果只追加一行）"""
+        if self.score_db is not None:
+            return  # SQLite 后端每条记录插入时已提交
+        self.score_log.rewrite(self.high_score, self.score_history)
+    
+    def close(self):
+        """关闭分数日志与数据库（退出前调用）"""
+        self.score_log.close()
+        if self.score_db is not None:
+            self.score_db.close()
     
     def get_high_score(self):
         """获取最高分"""
         return self.high_score
     
-    def update_high_score(self, new_score):
-        """更新最高分"""
+    def update_high_score(self, new_score, profile=None, skin=None):
+        """更新最高分（profile、skin 为可选的玩家与皮肤标记）"""
         is_new_record = False
         
         if new_score > self.high_score:
@@ -99,20 +120,38 @@ class ScoreManager:
             'timestamp': datetime.now().isoformat(),
             'is_record': is_new_record
         }
+        if profile is not None:
+            score_entry['profile'] = profile
+        if skin is not None:
+            score_entry['skin'] = skin
         
         self.score_history.append(score_entry)
+        self.stats.add(score_entry)
         
         # 保持历史记录在合理范围内
-        if len(self.score_history) > 100:
-            self.score_history = self.score_history[-100:]
+        if self.history_limit is not None and len(self.score_history) > self.history_limit:
+            for entry in self.score_history[:-self.history_limit]:
+                self.stats.remove(entry)
+            del self.score_history[:-self.history_limit]
         
-        # 保存数据
-        self.save_scores()
+        if self.score_db is not None:
+            self.score_db.add_score(new_score, score_entry['timestamp'], is_new_record, profile, skin)
+            if is_new_record:
+                self.score_db.set_high_score(self.high_score)
+            return is_new_record
+        
+        # 追加到分数日志，刷新纪录时改写快照头
+        self.score_log.append(score_entry)
+        if is_new_record:
+            self.score_log.set_high_score(self.high_score)
         
         return is_new_record
     
     def get_score_history(self, limit=10):
         """获取分数历史记录"""
+        if self.score_db is not None:
+            return self.score_db.get_recent(limit)
+        
         # 返回最近的记录，按时间倒序
         return sorted(self.score_history, 
                      key=lambda x: x['timestamp'], 
@@ -120,82 +159,86 @@ class ScoreManager:
     
     def get_average_score(self):
         """获取平均分"""
-        if not self.score_history:
-            return 0
+        if self.score_db is not None:
+            return self.score_db.get_average_score()
         
-        total_score = sum(entry['score'] for entry in self.score_history)
-        return total_score / len(self.score_history)
+        return self.stats.average()
     
     def get_total_games(self):
         """获取总游戏次数"""
-        return len(self.score_history)
+        if self.score_db is not None:
+            return self.score_db.get_total_games()
+        return self.stats.count
     
     def get_records_count(self):
         """获取破纪录次数"""
-        return sum(1 for entry in self.score_history if entry.get('is_record', False))
+        if self.score_db is not None:
+            return self.score_db.get_records_count()
+        return self.stats.records_count
     
     def reset_scores(self):
         """重置所有分数数据"""
         self.high_score = 0
         self.score_history = []
+        self.stats.rebuild(self.score_history)
+        if self.score_db is not None:
+            self.score_db.clear()
         self.save_scores()
     
     def export_scores(self, filename="score_export.json"):
-        """导出分数数据"""
+        """导出分数数据（逐条写出；.jsonl 文件每行一条记录）"""
         try:
-            export_data = {
+            summary = {
                 'high_score': self.high_score,
-                'score_history': self.score_history,
                 'export_date': datetime.now().isoformat(),
                 'total_games': self.get_total_games(),
                 'average_score': self.get_average_score(),
                 'records_count': self.get_records_count()
             }
+            history = self.score_history
+            if self.score_db is not None:
+                history = self.score_db.iter_entries()
             
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(export_data, f, ensure_ascii=False, indent=2)
-            
+            write_export(filename, summary, history)
             return True
         except Exception as e:
             print(f"导出分数数据失败: {e}")
             return False
     
-    def import_scores(self, filename):
-        """导入分数数据"""
+    def import_scores(self, filenames, workers=None, progress=None):
+        """导入分数数据（可传入多个档案文件）
+        各档案由工作进程并行增量解析并排序，再与现有记录多路归并、去重；
+        progress(阶段, 已完成, 总数) 报告进度，阶段为 parse（解析档案）或 merge（归并记录）"""
+        if isinstance(filenames, str):
+            filenames = [filenames]
+        filenames = [filename for filename in filenames if os.path.exists(filename)]
+        if not filenames:
+            return False
+        
+        sources = list(filenames)
+        if self.score_db is None and self.score_log.exists():
+            # 现有历史作为其中一路参与归并
+            self.score_log.close()
+            sources.append(self.score_log.filename)
+        
         try:
-            if not os.path.exists(filename):
-                return False
-            
-            with open(filename, 'r', encoding='utf-8') as f:
-                import_data = json.load(f)
-            
-            # 验证数据格式
-            if 'high_score' in import_data and 'score_history' in import_data:
-                self.high_score = max(self.high_score, import_data['high_score'])
-                
-                # 合并历史记录
-                imported_history = import_data['score_history']
-                self.score_history.extend(imported_history)
+            with ArchiveMerge(sources, workers, progress) as merge:
+                # 验证数据格式：至少有一个档案能被读取
+                if not set(merge.valid_files()) & set(filenames):
+                    return False
+                high_score = max(self.high_score, merge.high_score)
                 
-                # 去重并排序
-                seen = set()
-                unique_history = []
-                for entry in self.score_history:
-                    entry_key = (entry['score'], entry['timestamp'])
-                    if entry_key not in seen:
-                        seen.add(entry_key)
-                        unique_history.append(entry)
+                if self.score_db is not None:
+                    # 数据库按 (时间戳, 分数) 唯一索引去重
+                    self.score_db.add_entries(merge)
+                    self.score_db.set_high_score(max(high_score, self.score_db.get_high_score()))
+                    self._load_from_db()
+                    return True
                 
-                self.score_history = sorted(unique_history, 
-                                           key=lambda x: x['timestamp'])
-                
-                # 保持记录数量限制
-                if len(self.score_history) > 100:
-                    self.score_history = self.score_history[-100:]
-                
-                self.save_scores()
-                return True
+                self.score_log.rewrite(high_score, merge)
             
+            self.load_scores()
+            return True
         except Exception as e:
             print(f"导入分数数据失败: {e}")
         
@@ -203,7 +246,13 @@ class ScoreManager:
     
     def get_statistics(self):
         """获取统计信息"""
-        if not self.score_history:
+        if self.score_db is not None:
+            stats = self.score_db.get_statistics()
+            if stats is not None:
+                stats['high_score'] = self.high_score
+                return stats
+        
+        if not self.stats.count:
             return {
                 'total_games': 0,
                 'high_score': 0,
@@ -212,18 +261,15 @@ class ScoreManager:
                 'last_played': None
             }
         
-        # 计算统计数据
-        scores = [entry['score'] for entry in self.score_history]
-        last_entry = max(self.score_history, key=lambda x: x['timestamp'])
-        
+        # 由增量统计直接得到
         return {
-            'total_games': len(self.score_history),
+            'total_games': self.stats.count,
             'high_score': self.high_score,
-            'average_score': round(sum(scores) / len(scores), 1),
-            'lowest_score': min(scores),
-            'records_count': self.get_records_count(),
-            'last_played': last_entry['timestamp'],
-            'score_range': max(scores) - min(scores) if scores else 0
+            'average_score': round(self.stats.average(), 1),
+            'lowest_score': self.stats.lowest(),
+            'records_count': self.stats.records_count,
+            'last_played': self.stats.last_played,
+            'score_range': self.stats.highest() - self.stats.lowest()
         }
     
     def is_high_score(self, score):
@@ -232,14 +278,10 @@ class ScoreManager:
     
     def get_score_rank(self, score):
         """获取分数排名（在历史记录中的位置）"""
-        if not self.score_history:
-            return 1
+        if self.score_db is not None:
+            return self.score_db.get_rank(score)
         
-        scores = [entry['score'] for entry in self.score_history]
-        scores.append(score)
-        scores.sort(reverse=True)
-        
-        return scores.index(score) + 1
+        return self.stats.rank(score)
     
     def get_recent_improvement(self, limit=5):
         """获取最近的进步情况"""
@@ -258,4 +300,42 @@ class ScoreManager:
             'improvement': improvement,
             'average_recent': round(average_recent, 1),
             'trend': 'improving' if improvement > 0 else 'declining' if improvement < 0 else 'stable'
-        }
\ No newline at end of file
+        }
+    
+    def get_top_scores(self, limit=10, start=None, end=None):
+        """获取分数最高的记录（同分时较新的在前；start/end 为ISO格式时间戳，区间为 [start, end)）"""
+        if self.score_db is not None:
+            return self.score_db.get_top_scores(limit, start, end)
+        
+        entries = [entry for entry in self.score_history
+                   if (start is None or entry['timestamp'] >= start) and (end is None or entry['timestamp'] < end)]
+        return sorted(entries, key=lambda x: (x['score'], x['timestamp']), reverse=True)[:limit]
+    
+    def get_percentile(self, fraction):
+        """获取历史分数的百分位数（最近秩法，fraction 取 0~1）"""
+        if self.score_db is not None:
+            return self.score_db.get_percentile(fraction)
+        return self.stats.percentile(fraction)
+    
+    def get_window_statistics(self, start=None, end=None):
+        """获取时间窗口内的统计（start/end 为ISO格式时间戳，区间为 [start, end)）"""
+        if self.score_db is not None:
+            return self.score_db.get_window_statistics(start, end)
+        
+        entries = [entry for entry in self.score_history
+                   if (start is None or entry['timestamp'] >= start) and (end is None or entry['timestamp'] < end)]
+        scores = [entry['score'] for entry in entries]
+        return {
+            'total_games': len(scores),
+            'average_score': round(sum(scores) / len(scores), 1) if scores else 0,
+            'lowest_score': min(scores) if scores else 0,
+            'high_score': max(scores) if scores else 0,
+            'records_count': sum(1 for entry in entries if entry.get('is_record', False)),
+            'last_played': max((entry['timestamp'] for entry in entries), default=None)
+        }
+    
+    def get_score_histogram(self, bins=10):
+        """获取分数分布直方图，返回 [(下界, 上界, 次数)]（区间为 [下界, 上界)）"""
+        if self.score_db is not None:
+            return self.score_db.get_histogram(bins)
+        return self.stats.histogram(bins)
\ No newline at end of file
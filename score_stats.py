@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+分数统计模块
+随每条记录的加入与移除增量维护次数、总分、破纪录次数、最近游戏时间与有序分数列表，
+平均分与最高/最低分 O(1)，排名、百分位与直方图通过二分查找得到（排名与百分位 O(log n)）；
+有序分数列表是普通列表，加入与移除需要移动元素，为 O(n)（默认100条历史上限时开销很小）
+"""
+
+import math
+from bisect import bisect_left, bisect_right, insort
+from stats_util import percentile
+
+class ScoreStats:
+    """分数记录的增量统计"""
+    
+    def __init__(self, entries=()):
+        """初始化统计"""
+        self.rebuild(entries)
+    
+    def rebuild(self, entries):
+        """按给定记录重新计算"""
+        self.sorted_scores = sorted(entry['score'] for entry in entries)
+        self.total = sum(self.sorted_scores)
+        self.records_count = sum(1 for entry in entries if entry.get('is_record', False))
+        self.last_played = max((entry['timestamp'] for entry in entries), default=None)
+    
+    def add(self, entry):
+        """加入一条记录（有序列表插入，O(n)）"""
+        insort(self.sorted_scores, entry['score'])
+        self.total += entry['score']
+        if entry.get('is_record', False):
+            self.records_count += 1
+        if self.last_played is None or entry['timestamp'] > self.last_played:
+            self.last_played = entry['timestamp']
+    
+    def remove(self, entry):
+        """移除一条记录（超出历史条数上限时调用，移除的是最早的记录，不影响最近游戏时间；有序列表删除，O(n)）"""
+        index = bisect_left(self.sorted_scores, entry['score'])
+        if index < len(self.sorted_scores) and self.sorted_scores[index] == entry['score']:
+            del self.sorted_scores[index]
+            self.total -= entry['score']
+            if entry.get('is_record', False):
+                self.records_count -= 1
+        if not self.sorted_scores:
+            self.last_played = None
+    
+    @property
+    def count(self):
+        """记录条数"""
+        return len(self.sorted_scores)
+    
+    def average(self):
+        """平均分"""
+        return self.total / len(self.sorted_scores) if self.sorted_scores else 0
+    
+    def lowest(self):
+        """最低分"""
+        return self.sorted_scores[0] if self.sorted_scores else 0
+    
+    def highest(self):
+        """最高分"""
+        return self.sorted_scores[-1] if self.sorted_scores else 0
+    
+    def rank(self, score):
+        """分数的排名（比它高的记录数 + 1）"""
+        return len(self.sorted_scores) - bisect_right(self.sorted_scores, score) + 1
+    
+    def percentile(self, fraction):
+        """最近秩法的百分位分数"""
+        return percentile(self.sorted_scores, fraction)
+    
+    def histogram(self, bins=10):
+        """等宽直方图，返回 [(下界, 上界, 次数)]（区间为 [下界, 上界)）"""
+        if not self.sorted_scores:
+            return []
+        low, high = self.sorted_scores[0], self.sorted_scores[-1]
+        width = max(1, math.ceil((high - low + 1) / bins))
+        result = []
+        start = 0
+        for i in range(bins):
+            upper = low + (i + 1) * width
+            end = bisect_left(self.sorted_scores, upper) if i < bins - 1 else len(self.sorted_scores)
+            result.append((low + i * width, min(upper, high + 1), end - start))
+            start = end
+            if upper > high:
+                break
+        return result
\ No newline at end of file
@@ -6,15 +6,19 @@
 """
 
 import pygame
-import json
 import os
+from config_store import get_config_store
+
+# 图集中图块的排列顺序
+ATLAS_PARTS = ("head", "body", "food")
 
 class SkinManager:
     """皮肤管理器类"""
     
-    def __init__(self):
-        """初始化皮肤管理器"""
-        self.config_file = "config.json"
+    def __init__(self, config_store=None):
+        """初始化皮肤管理器（config_store 为None时使用 config.json 的共享存储）"""
+        self.config_store = config_store or get_config_store()
+        self.config_file = self.config_store.config_file
         
         # 定义可用皮肤
         self.available_skins = {
@@ -49,34 +53,21 @@ class SkinManager:
         
         # 皮肤资源缓存
         self.skin_cache = {}
+        
+        # 预缩放图集缓存 {(皮肤, 图块尺寸, 食物颜色): (图集表面, {部位: 区域})}
+        self.atlas_cache = {}
     
     def load_config(self):
-        """加载配置文件"""
-        try:
-            if os.path.exists(self.config_file):
-                with open(self.config_file, 'r', encoding='utf-8') as f:
-                    config = json.load(f)
-                    self.current_skin = config.get('current_skin', 'classic')
-                    
-                    # 验证皮肤是否存在
-                    if self.current_skin not in self.available_skins:
-                        self.current_skin = 'classic'
-        except Exception as e:
-            print(f"加载配置文件失败: {e}")
+        """从共享配置读取当前皮肤"""
+        self.current_skin = self.config_store.get('current_skin', 'classic')
+        
+        # 验证皮肤是否存在
+        if self.current_skin not in self.available_skins:
             self.current_skin = 'classic'
     
     def save_config(self):
-        """保存配置文件"""
-        try:
-            config = {
-                'current_skin': self.current_skin,
-                'version': '1.0.0'
-            }
-            
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(config, f, ensure_ascii=False, indent=2)
-        except Exception as e:
-            print(f"保存配置文件失败: {e}")
+        """保存当前皮肤（只修改皮肤相关的配置项，由后台线程写盘）"""
+        self.config_store.update(current_skin=self.current_skin, version='1.0.0')
     
     def get_current_skin(self):
         """获取当前皮肤名称"""
@@ -150,104 +141,127 @@ class SkinManager:
         # 如果图片加载失败，返回None（使用颜色绘制）
         return None
     
-    def draw_snake_segment(self, screen, rect, is_head=False, skin_name=None):
-        """绘制蛇身段"""
-        skin_name = skin_name or self.current_skin
-        
-        # 尝试加载精灵图片
-        sprite_type = "head" if is_head else "body"
-        sprite = self.load_skin_sprite(skin_name, sprite_type)
-        
-        if sprite:
-            # 缩放精灵到合适大小
-            scaled_sprite = pygame.transform.scale(sprite, (rect.width, rect.height))
-            screen.blit(scaled_sprite, rect)
-        else:
-            # 使用颜色绘制
-            if is_head:
-                color = self.get_snake_head_color(skin_name)
-            else:
-                color = self.get_snake_body_color(skin_name)
-            
-            pygame.draw.rect(screen, color, rect)
+    def invalidate_atlas(self):
+        """丢弃图集与已转换的精灵（显示模式变化后调用，格子尺寸变化时会按新尺寸重新生成）"""
+        self.atlas_cache.clear()
+        self.skin_cache.clear()
+    
+    def get_atlas(self, skin_name, tile_size, food_color=None):
+        """获取皮肤图集，返回 (图集表面, {部位: 区域})（food_color 为None时使用皮肤的食物颜色）"""
+        key = (skin_name, tile_size, food_color)
+        atlas = self.atlas_cache.get(key)
+        if atlas is None:
+            atlas = self._build_atlas(skin_name, tile_size, food_color)
+            self.atlas_cache[key] = atlas
+        return atlas
+    
+    def _build_atlas(self, skin_name, tile_size, food_color=None):
+        """把头、身体、食物图块横向排进一张表面并转换为显示格式：
+        有精灵图片的部位缩放一次，其余部位把颜色与装饰绘制一次"""
+        width, height = tile_size
+        surface = pygame.Surface((width * len(ATLAS_PARTS), height), pygame.SRCALPHA)
+        areas = {}
+        for i, part in enumerate(ATLAS_PARTS):
+            area = pygame.Rect(i * width, 0, width, height)
+            sprite = self.load_skin_sprite(skin_name, part)
             
-            # 添加一些装饰效果
-            if skin_name == "neko":
-                # 猫耳蛇：添加可爱的点点
-                if is_head:
-                    # 绘制眼睛
-                    eye_size = 3
-                    left_eye = (rect.x + rect.width//3, rect.y + rect.height//3)
-                    right_eye = (rect.x + 2*rect.width//3, rect.y + rect.height//3)
-                    pygame.draw.circle(screen, (0, 0, 0), left_eye, eye_size)
-                    pygame.draw.circle(screen, (0, 0, 0), right_eye, eye_size)
-                else:
-                    # 身体上的小点
-                    dot_color = (255, 255, 255)
-                    center = rect.center
-                    pygame.draw.circle(screen, dot_color, center, 2)
+            # 装饰图形可能超出格子，限制在本图块内以免画到相邻图块
+            surface.set_clip(area)
+            if sprite:
+                surface.blit(pygame.transform.scale(sprite, tile_size), area)
+            elif part == "food":
+                self._paint_food(surface, area, skin_name, food_color or self.get_food_color(skin_name))
+            else:
+                self._paint_segment(surface, area, part == "head", skin_name)
             
-            elif skin_name == "dragon":
-                # 龙形蛇：添加鳞片效果
-                scale_color = (255, 255, 0)
-                if is_head:
-                    # 龙头装饰
-                    pygame.draw.circle(screen, scale_color, rect.center, rect.width//4)
-                else:
-                    # 鳞片纹理
-                    for i in range(0, rect.width, 6):
-                        for j in range(0, rect.height, 6):
-                            if (i + j) % 12 == 0:
-                                pygame.draw.circle(screen, scale_color, 
-                                                 (rect.x + i, rect.y + j), 1)
+            # 绘制边框（格子过小时省略）
+            if min(tile_size) >= 4:
+                pygame.draw.rect(surface, (255, 255, 255), area, 1)
+            areas[part] = area
+        surface.set_clip(None)
         
-        # 绘制边框
-        pygame.draw.rect(screen, (255, 255, 255), rect, 1)
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert_alpha()
+        return surface, areas
     
-    def draw_food(self, screen, rect, skin_name=None):
-        """绘制食物"""
-        skin_name = skin_name or self.current_skin
+    def _paint_segment(self, surface, rect, is_head, skin_name):
+        """用颜色与装饰绘制蛇身段图块"""
+        if is_head:
+            color = self.get_snake_head_color(skin_name)
+        else:
+            color = self.get_snake_body_color(skin_name)
         
-        # 尝试加载食物精灵
-        sprite = self.load_skin_sprite(skin_name, "food")
+        pygame.draw.rect(surface, color, rect)
         
-        if sprite:
-            scaled_sprite = pygame.transform.scale(sprite, (rect.width, rect.height))
-            screen.blit(scaled_sprite, rect)
-        else:
-            # 使用颜色和形状绘制
-            food_color = self.get_food_color(skin_name)
-            
-            if skin_name == "classic":
-                # 经典：简单的方块
-                pygame.draw.rect(screen, food_color, rect)
-            elif skin_name == "neko":
-                # 猫耳：心形食物
-                center = rect.center
-                radius = rect.width // 3
-                # 简化的心形（两个圆加一个三角形）
-                pygame.draw.circle(screen, food_color, 
-                                 (center[0] - radius//2, center[1] - radius//2), radius//2)
-                pygame.draw.circle(screen, food_color, 
-                                 (center[0] + radius//2, center[1] - radius//2), radius//2)
-                points = [(center[0], center[1] + radius//2),
-                         (center[0] - radius, center[1]),
-                         (center[0] + radius, center[1])]
-                pygame.draw.polygon(screen, food_color, points)
-            elif skin_name == "dragon":
-                # 龙形：宝石形状
+        # 添加一些装饰效果
+        if skin_name == "neko":
+            # 猫耳蛇：添加可爱的点点
+            if is_head:
+                # 绘制眼睛
+                eye_size = 3
+                left_eye = (rect.x + rect.width//3, rect.y + rect.height//3)
+                right_eye = (rect.x + 2*rect.width//3, rect.y + rect.height//3)
+                pygame.draw.circle(surface, (0, 0, 0), left_eye, eye_size)
+                pygame.draw.circle(surface, (0, 0, 0), right_eye, eye_size)
+            else:
+                # 身体上的小点
+                dot_color = (255, 255, 255)
                 center = rect.center
-                size = rect.width // 2
-                points = [
-                    (center[0], center[1] - size),  # 上
-                    (center[0] + size, center[1]),  # 右
-                    (center[0], center[1] + size),  # 下
-                    (center[0] - size, center[1])   # 左
-                ]
-                pygame.draw.polygon(screen, food_color, points)
+                pygame.draw.circle(surface, dot_color, center, 2)
         
-        # 绘制边框
-        pygame.draw.rect(screen, (255, 255, 255), rect, 1)
+        elif skin_name == "dragon":
+            # 龙形蛇：添加鳞片效果
+            scale_color = (255, 255, 0)
+            if is_head:
+                # 龙头装饰
+                pygame.draw.circle(surface, scale_color, rect.center, rect.width//4)
+            else:
+                # 鳞片纹理
+                for i in range(0, rect.width, 6):
+                    for j in range(0, rect.height, 6):
+                        if (i + j) % 12 == 0:
+                            pygame.draw.circle(surface, scale_color, 
+                                             (rect.x + i, rect.y + j), 1)
+    
+    def _paint_food(self, surface, rect, skin_name, food_color):
+        """用颜色和形状绘制食物图块"""
+        if skin_name == "neko":
+            # 猫耳：心形食物
+            center = rect.center
+            radius = rect.width // 3
+            # 简化的心形（两个圆加一个三角形）
+            pygame.draw.circle(surface, food_color, 
+                             (center[0] - radius//2, center[1] - radius//2), radius//2)
+            pygame.draw.circle(surface, food_color, 
+                             (center[0] + radius//2, center[1] - radius//2), radius//2)
+            points = [(center[0], center[1] + radius//2),
+                     (center[0] - radius, center[1]),
+                     (center[0] + radius, center[1])]
+            pygame.draw.polygon(surface, food_color, points)
+        elif skin_name == "dragon":
+            # 龙形：宝石形状
+            center = rect.center
+            size = rect.width // 2
+            points = [
+                (center[0], center[1] - size),  # 上
+                (center[0] + size, center[1]),  # 右
+                (center[0], center[1] + size),  # 下
+                (center[0] - size, center[1])   # 左
+            ]
+            pygame.draw.polygon(surface, food_color, points)
+        else:
+            # 经典：简单的方块
+            pygame.draw.rect(surface, food_color, rect)
+    
+    def draw_snake_segment(self, screen, rect, is_head=False, skin_name=None):
+        """绘制蛇身段（从图集中按区域贴图）"""
+        atlas, areas = self.get_atlas(skin_name or self.current_skin, rect.size)
+        screen.blit(atlas, rect, areas["head" if is_head else "body"])
+    
+    def draw_food(self, screen, rect, skin_name=None):
+        """绘制食物（从图集中按区域贴图）"""
+        atlas, areas = self.get_atlas(skin_name or self.current_skin, rect.size)
+        screen.blit(atlas, rect, areas["food"])
     
     def get_skin_preview_color(self, skin_name):
         """获取皮肤预览颜色（用于菜单显示）"""
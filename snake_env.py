@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+强化学习环境模块
+以 reset/step 接口包装 SnakeSimulation，观测为占用网格的零拷贝NumPy视图
+（需要安装 numpy）
+"""
+
+import numpy as np
+from game_core import Direction, GameState, SnakeSimulation
+
+# 动作编号与 Direction 枚举顺序一致：上、下、左、右
+ACTIONS = list(Direction)
+
+class SnakeEnv:
+    """单局贪吃蛇环境（Gym风格接口）"""
+    
+    def __init__(self, grid_width=20, grid_height=15, **sim_options):
+        """初始化环境"""
+        self.sim = SnakeSimulation(grid_width, grid_height, **sim_options)
+        self.action_count = len(ACTIONS)
+        self.observation_shape = (grid_height, grid_width)
+        
+        # 观测直接引用模拟核心的占用网格缓冲区（只读，无需复制）
+        self._observation = np.frombuffer(self.sim.grid, dtype=np.uint8).reshape(self.observation_shape)
+        self._observation.flags.writeable = False
+    
+    def reset(self, seed=None):
+        """开始新的一局（可指定种子），返回初始观测"""
+        self.sim.reset(seed)
+        return self._observation
+    
+    def step(self, action):
+        """执行一个动作，返回 (观测, 奖励, 是否结束, 信息)
+        
+        action 可以是动作编号（0上 1下 2左 3右）、Direction 或 None（保持方向）。
+        奖励为本步得分变化（每个食物+10）。
+        """
+        if isinstance(action, (int, np.integer)):
+            action = ACTIONS[action]
+        
+        previous_score = self.sim.score
+        state, events = self.sim.step(action)
+        reward = self.sim.score - previous_score
+        done = state == GameState.GAME_OVER or state == GameState.VICTORY
+        
+        info = {
+            "state": state,
+            "score": self.sim.score,
+            "length": len(self.sim.snake),
+            "events": events
+        }
+        return self._observation, reward, done, info
\ No newline at end of file
@@ -0,0 +1,15 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+统计工具模块
+锦标赛、帧耗时分析、分数统计与基准测试共用的百分位计算（不依赖其他游戏模块）
+"""
+
+import math
+
+def percentile(sorted_values, fraction):
+    """最近秩法计算百分位数（输入需已排序）"""
+    if not sorted_values:
+        return 0
+    rank = min(len(sorted_values), max(1, math.ceil(fraction * len(sorted_values))))
+    return sorted_values[rank - 1]
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+文字渲染缓存模块
+按 (字体, 文字, 颜色, 抗锯齿) 缓存 font.render 的结果，超出容量时淘汰最久未使用的条目
+（返回的表面在多处共享，调用方不要在上面绘制）
+"""
+
+from collections import OrderedDict
+
+class TextCache:
+    """带LRU淘汰与命中统计的文字表面缓存"""
+    
+    def __init__(self, max_entries=256):
+        """初始化缓存"""
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def render(self, font, text, color, antialias=True):
+        """获取渲染好的文字表面（未命中时调用 font.render）"""
+        key = (font, text, tuple(color), antialias)
+        surface = self.entries.get(key)
+        if surface is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return surface
+        
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self.entries[key] = surface
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+        return surface
+    
+    def clear(self):
+        """清空缓存（字体重新加载或显示模式变化后调用）"""
+        self.entries.clear()
+    
+    def get_stats(self):
+        """获取命中统计"""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self.entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0
+        }
+
+# 进程内共享的默认缓存
+text_cache = TextCache()
+
+def render_text(font, text, color, antialias=True):
+    """通过共享缓存渲染文字"""
+    return text_cache.render(font, text, color, antialias)
\ No newline at end of file
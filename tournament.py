@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+机器人锦标赛模块
+在所有CPU核心上并行运行大量无显示对局，统计分数、长度、步数与死亡原因
+
+用法示例:
+    python tournament.py --games 10000 --policy greedy --output results.json
+    python tournament.py --policy my_bots:smart_policy
+    python tournament.py --policy greedy --record 1234   # 将种子1234的对局保存为回放
+
+策略为可调用对象 policy(sim, rng) -> Direction 或 None（保持当前方向），
+内置策略: random, greedy, autopilot；也可以用 "模块:函数" 指定自定义策略。
+"""
+
+import argparse
+import importlib
+import json
+import os
+import random
+import sys
+import time
+from multiprocessing import Pool
+from game_core import Direction, GameState, OPPOSITE_DIRECTIONS, SnakeSimulation
+from replay import ReplayRecorder
+from autopilot import autopilot_policy
+from stats_util import percentile
+
+def _safe_directions(sim):
+    """返回不会立即碰撞的方向列表"""
+    head_x, head_y = sim.snake[0]
+    safe = []
+    for direction in Direction:
+        if direction == OPPOSITE_DIRECTIONS[sim.direction]:
+            continue
+        dx, dy = direction.value
+        if not sim.check_collision((head_x + dx, head_y + dy)):
+            safe.append(direction)
+    return safe
+
+def random_policy(sim, rng):
+    """随机策略：在安全方向中随机选择"""
+    safe = _safe_directions(sim)
+    return rng.choice(safe) if safe else None
+
+def greedy_policy(sim, rng):
+    """贪心策略：在安全方向中选择离最近食物最近的方向"""
+    safe = _safe_directions(sim)
+    if not safe:
+        return None
+    if not sim.foods:
+        return rng.choice(safe)
+    
+    head_x, head_y = sim.snake[0]
+    
+    def distance_after(direction):
+        dx, dy = direction.value
+        x, y = head_x + dx, head_y + dy
+        return min(abs(x - fx) + abs(y - fy) for fx, fy in sim.foods)
+    
+    return min(safe, key=distance_after)
+
+BUILTIN_POLICIES = {
+    "random": random_policy,
+    "greedy": greedy_policy,
+    "autopilot": autopilot_policy
+}
+
+# 每个工作进程内缓存已解析的策略
+_policy_cache = {}
+
+def resolve_policy(spec):
+    """根据名称或 "模块:函数" 解析策略"""
+    if spec in _policy_cache:
+        return _policy_cache[spec]
+    
+    if spec in BUILTIN_POLICIES:
+        policy = BUILTIN_POLICIES[spec]
+    elif ":" in spec:
+        module_name, function_name = spec.split(":", 1)
+        policy = getattr(importlib.import_module(module_name), function_name)
+    else:
+        raise ValueError(f"未知的策略: {spec}")
+    
+    _policy_cache[spec] = policy
+    return policy
+
+def run_game(task, recorder=None):
+    """运行一局无显示对局并返回结果（可选录制回放）"""
+    seed, policy_spec, max_ticks, grid_width, grid_height = task
+    policy = resolve_policy(policy_spec)
+    sim = SnakeSimulation(grid_width, grid_height, seed=seed)
+    # 策略使用独立的随机流，避免与食物生成共用同一序列
+    policy_rng = random.Random(f"policy-{seed}")
+    
+    state = sim.state
+    while state == GameState.PLAYING and sim.tick_count < max_ticks:
+        action = policy(sim, policy_rng)
+        if action is not None:
+            sim.set_direction(action)
+        if recorder is not None:
+            recorder.record(sim.next_direction, False)
+        state, _ = sim.step()
+    
+    if state == GameState.VICTORY:
+        cause = "victory"
+    elif state == GameState.GAME_OVER:
+        cause = sim.death_cause
+    else:
+        cause = "timeout"
+    
+    return {
+        "seed": seed,
+        "score": sim.score,
+        "length": len(sim.snake),
+        "ticks": sim.tick_count,
+        "cause": cause
+    }
+
+def summarize(values):
+    """计算均值与常用百分位数"""
+    ordered = sorted(values)
+    return {
+        "mean": round(sum(ordered) / len(ordered), 3) if ordered else 0,
+        "min": ordered[0] if ordered else 0,
+        "p50": percentile(ordered, 0.50),
+        "p90": percentile(ordered, 0.90),
+        "p99": percentile(ordered, 0.99),
+        "max": ordered[-1] if ordered else 0
+    }
+
+def aggregate(results, victory_length=300):
+    """汇总所有对局结果"""
+    causes = {}
+    for result in results:
+        causes[result["cause"]] = causes.get(result["cause"], 0) + 1
+    
+    wins = sum(1 for result in results if result["length"] >= victory_length)
+    return {
+        "games": len(results),
+        "score": summarize([result["score"] for result in results]),
+        "length": summarize([result["length"] for result in results]),
+        "ticks": summarize([result["ticks"] for result in results]),
+        "win_rate": round(wins / len(results), 6) if results else 0,
+        "causes": causes
+    }
+
+def run_tournament(games, policy_spec, base_seed=0, workers=None, chunk_size=None,
+                   max_ticks=100000, grid_width=20, grid_height=15, progress=True):
+    """并行运行锦标赛，返回 (汇总结果, 每局结果列表)"""
+    workers = workers or os.cpu_count() or 1
+    chunk_size = chunk_size or max(1, games // (workers * 8))
+    tasks = [(base_seed + i, policy_spec, max_ticks, grid_width, grid_height) for i in range(games)]
+    
+    results = []
+    with Pool(workers) as pool:
+        for result in pool.imap_unordered(run_game, tasks, chunksize=chunk_size):
+            results.append(result)
+            if progress and len(results) % max(1, games // 20) == 0:
+                print(f"进度: {len(results)}/{games}", file=sys.stderr)
+    
+    results.sort(key=lambda result: result["seed"])
+    return aggregate(results), results
+
+def main():
+    """命令行入口"""
+    parser = argparse.ArgumentParser(description="贪吃蛇机器人锦标赛（无显示并行对局）")
+    parser.add_argument("--games", type=int, default=1000, help="对局数量")
+    parser.add_argument("--policy", default="greedy", help="策略名称或 模块:函数")
+    parser.add_argument("--seed", type=int, default=0, help="起始种子（第i局使用 seed+i）")
+    parser.add_argument("--workers", type=int, default=None, help="工作进程数（默认CPU核心数）")
+    parser.add_argument("--chunk-size", type=int, default=None, help="每批分发给工作进程的对局数")
+    parser.add_argument("--max-ticks", type=int, default=100000, help="单局最大步数")
+    parser.add_argument("--output", default="tournament_results.json", help="结果输出文件（JSON）")
+    parser.add_argument("--record", type=int, metavar="SEED", help="只运行指定种子的一局并保存回放")
+    args = parser.parse_args()
+    
+    resolve_policy(args.policy)  # 提前校验策略名称
+    
+    if args.record is not None:
+        recorder = ReplayRecorder(20, 15, args.record)
+        result = run_game((args.record, args.policy, args.max_ticks, 20, 15), recorder)
+        filename = recorder.save(f"replays/tournament_{args.policy.replace(':', '_')}_{args.record}.snkr")
+        print(json.dumps(result, ensure_ascii=False))
+        print(f"回放已保存: {filename}")
+        return
+    
+    start = time.perf_counter()
+    summary, results = run_tournament(args.games, args.policy, args.seed, args.workers,
+                                      args.chunk_size, args.max_ticks)
+    elapsed = time.perf_counter() - start
+    
+    summary["policy"] = args.policy
+    summary["base_seed"] = args.seed
+    summary["elapsed_seconds"] = round(elapsed, 3)
+    
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump({"summary": summary, "results": results}, f, ensure_ascii=False, indent=2)
+    
+    print(json.dumps(summary, ensure_ascii=False, indent=2))
+    print(f"结果已写入: {args.output}")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
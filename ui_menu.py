@@ -6,6 +6,8 @@ UI菜单模块
 """
 
 import pygame
+from text_cache import render_text
+from font_service import get_chinese_font
 
 class Button:
     """按钮类"""
@@ -18,6 +20,10 @@ class Button:
         self.hover_color = hover_color
         self.text_color = text_color
         self.is_hovered = False
+        
+        # 按钮文字只渲染一次
+        self.text_surface = render_text(font, text, text_color)
+        self.text_rect = self.text_surface.get_rect(center=self.rect.center)
     
     def handle_event(self, event):
         """处理事件"""
@@ -35,29 +41,54 @@ class Button:
         pygame.draw.rect(screen, (255, 255, 255), self.rect, 2)
         
         # 绘制文字
-        text_surface = self.font.render(self.text, True, self.text_color)
-        text_rect = text_surface.get_rect(center=self.rect.center)
-        screen.blit(text_surface, text_rect)
+        screen.blit(self.text_surface, self.text_rect)
 
 class MainMenu:
     """主菜单类"""
     
-    def __init__(self, screen, skin_manager, score_manager):
+    def __init__(self, screen, skin_manager, score_manager, victory_length=300):
         self.screen = screen
         self.skin_manager = skin_manager
         self.score_manager = score_manager
+        self.victory_length = victory_length
         
         # 字体 - 使用系统中文字体
-        self.title_font = self._get_chinese_font(48)
-        self.button_font = self._get_chinese_font(24)
-        self.info_font = self._get_chinese_font(20)
+        self.title_font = get_chinese_font(48)
+        self.button_font = get_chinese_font(24)
+        self.info_font = get_chinese_font(20)
         
         # 按钮设置 - 响应式布局
         self.buttons = {}  # 初始化空字典
-        self.update_button_layout()
         
         # 背景颜色
         self.bg_color = (26, 26, 46)
+        
+        # 上次绘制时的显示内容（用于脏矩形模式判断是否需要重绘）
+        self._drawn_key = None
+        
+        # 按屏幕尺寸缓存的按钮布局与静态图层（渐变背景、标题、操作说明）
+        self.static_layer = None
+        self._layout_size = None
+        self.refresh_layout()
+    
+    def refresh_layout(self):
+        """屏幕尺寸变化时重建按钮布局与静态图层"""
+        size = self.screen.get_size()
+        if size == self._layout_size:
+            return
+        self._layout_size = size
+        self.update_button_layout()
+        
+        self.static_layer = pygame.Surface(size)
+        if pygame.display.get_surface() is not None:
+            self.static_layer = self.static_layer.convert()
+        self.draw_background(self.static_layer)
+        self.draw_title(self.static_layer)
+        self.draw_controls(self.static_layer)
+    
+    def invalidate_layout(self):
+        """显示模式变化（如切换全屏）后调用，下一帧重建缓存"""
+        self._layout_size = None
     
     def update_button_layout(self):
         """更新按钮布局以适应不同屏幕尺寸"""
@@ -85,33 +116,6 @@ class MainMenu:
                           (100, 100, 100), (150, 150, 150))
         }
     
-    def _get_chinese_font(self, size):
-        """获取支持中文的字体"""
-        # 尝试加载系统中文字体，按优先级排序
-        font_names = [
-            'Microsoft YaHei',  # 微软雅黑
-            'SimHei',           # 黑体
-            'SimSun',           # 宋体
-            'KaiTi',            # 楷体
-            'FangSong',         # 仿宋
-            'Arial Unicode MS', # Arial Unicode
-            'DejaVu Sans',      # Linux常用字体
-            'Noto Sans CJK SC'  # Google Noto字体
-        ]
-        
-        for font_name in font_names:
-            try:
-                font = pygame.font.SysFont(font_name, size)
-                # 测试字体是否支持中文
-                test_surface = font.render('测试', True, (255, 255, 255))
-                if test_surface.get_width() > 0:
-                    return font
-            except:
-                continue
-        
-        # 如果所有字体都失败，使用默认字体
-        return pygame.font.Font(None, size)
-    
     def handle_event(self, event):
         """处理事件"""
         for button_name, button in self.buttons.items():
@@ -134,66 +138,77 @@ class MainMenu:
         
         return None
     
-    def draw_background(self):
+    def draw_background(self, surface):
         """绘制背景"""
         # 渐变背景
-        for y in range(self.screen.get_height()):
-            ratio = y / self.screen.get_height()
+        for y in range(surface.get_height()):
+            ratio = y / surface.get_height()
             r = int(26 + (22 - 26) * ratio)
             g = int(26 + (22 - 26) * ratio)
             b = int(46 + (62 - 46) * ratio)
             color = (r, g, b)
-            pygame.draw.line(self.screen, color, (0, y), (self.screen.get_width(), y))
+            pygame.draw.line(surface, color, (0, y), (surface.get_width(), y))
     
-    def draw_title(self):
+    def draw_title(self, surface):
         """绘制标题"""
         title_text = "贪吃蛇 - Anime Edition"
-        title_surface = self.title_font.render(title_text, True, (255, 215, 0))  # 金黄色
-        title_rect = title_surface.get_rect(center=(self.screen.get_width()//2, 150))
+        title_surface = render_text(self.title_font, title_text, (255, 215, 0))  # 金黄色
+        title_rect = title_surface.get_rect(center=(surface.get_width()//2, 150))
         
         # 添加阴影效果
-        shadow_surface = self.title_font.render(title_text, True, (50, 50, 50))
-        shadow_rect = shadow_surface.get_rect(center=(self.screen.get_width()//2 + 2, 152))
-        self.screen.blit(shadow_surface, shadow_rect)
-        self.screen.blit(title_surface, title_rect)
+        shadow_surface = render_text(self.title_font, title_text, (50, 50, 50))
+        shadow_rect = shadow_surface.get_rect(center=(surface.get_width()//2 + 2, 152))
+        surface.blit(shadow_surface, shadow_rect)
+        surface.blit(title_surface, title_rect)
+    
+    def draw_controls(self, surface):
+        """绘制控制说明"""
+        controls = [
+            "控制: 方向键 或 WASD",
+            "暂停: ESC 或 P",
+            "全屏: F11",
+            "自动驾驶: TAB",
+            f"目标: 蛇长度达到{self.victory_length}获胜"
+        ]
+        
+        start_y = surface.get_height() - 130
+        for i, control in enumerate(controls):
+            control_surface = render_text(self.info_font, control, (150, 150, 150))
+            control_rect = control_surface.get_rect(center=(surface.get_width()//2, start_y + i * 20))
+            surface.blit(control_surface, control_rect)
     
     def draw_info(self):
-        """绘制信息"""
+        """绘制信息（最高分与当前皮肤）"""
         # 最高分
         high_score = self.score_manager.get_high_score()
         high_score_text = f"最高分: {high_score}"
-        high_score_surface = self.info_font.render(high_score_text, True, (255, 255, 255))
+        high_score_surface = render_text(self.info_font, high_score_text, (255, 255, 255))
         high_score_rect = high_score_surface.get_rect(center=(self.screen.get_width()//2, 220))
         self.screen.blit(high_score_surface, high_score_rect)
         
         # 当前皮肤
         current_skin = self.skin_manager.get_current_skin()
         skin_text = f"当前皮肤: {current_skin}"
-        skin_surface = self.info_font.render(skin_text, True, (200, 200, 200))
+        skin_surface = render_text(self.info_font, skin_text, (200, 200, 200))
         skin_rect = skin_surface.get_rect(center=(self.screen.get_width()//2, 245))
         self.screen.blit(skin_surface, skin_rect)
-        
-        # 控制说明
-        controls = [
-            "控制: 方向键 或 WASD",
-            "暂停: ESC 或 P",
-            "全屏: F11",
-            "目标: 蛇长度达到300获胜"
-        ]
-        
-        start_y = self.screen.get_height() - 120
-        for i, control in enumerate(controls):
-            control_surface = self.info_font.render(control, True, (150, 150, 150))
-            control_rect = control_surface.get_rect(center=(self.screen.get_width()//2, start_y + i * 20))
-            self.screen.blit(control_surface, control_rect)
+    
+    def collect_dirty_rects(self):
+        """菜单内容变化时返回None（整屏重绘），否则返回空列表"""
+        key = (self.screen.get_size(), self.score_manager.get_high_score(),
+               self.skin_manager.get_current_skin(),
+               tuple(button.is_hovered for button in self.buttons.values()))
+        if key == self._drawn_key:
+            return []
+        self._drawn_key = key
+        return None
     
     def draw(self):
         """绘制主菜单"""
-        # 更新按钮布局以适应当前屏幕尺寸
-        self.update_button_layout()
+        # 屏幕尺寸变化时才重建布局与静态图层
+        self.refresh_layout()
         
-        self.draw_background()
-        self.draw_title()
+        self.screen.blit(self.static_layer, (0, 0))
         self.draw_info()
         
         # 绘制按钮
@@ -205,8 +220,8 @@ class PauseMenu:
     
     def __init__(self, screen):
         self.screen = screen
-        self.font = self._get_chinese_font(36)
-        self.button_font = self._get_chinese_font(24)
+        self.font = get_chinese_font(36)
+        self.button_font = get_chinese_font(24)
         
         # 按钮设置
         button_width = 180
@@ -234,33 +249,6 @@ class PauseMenu:
                           (150, 0, 0), (200, 0, 0))
         }
     
-    def _get_chinese_font(self, size):
-        """获取支持中文的字体"""
-        # 尝试加载系统中文字体，按优先级排序
-        font_names = [
-            'Microsoft YaHei',  # 微软雅黑
-            'SimHei',           # 黑体
-            'SimSun',           # 宋体
-            'KaiTi',            # 楷体
-            'FangSong',         # 仿宋
-            'Arial Unicode MS', # Arial Unicode
-            'DejaVu Sans',      # Linux常用字体
-            'Noto Sans CJK SC'  # Google Noto字体
-        ]
-        
-        for font_name in font_names:
-            try:
-                font = pygame.font.SysFont(font_name, size)
-                # 测试字体是否支持中文
-                test_surface = font.render('测试', True, (255, 255, 255))
-                if test_surface.get_width() > 0:
-                    return font
-            except:
-                continue
-        
-        # 如果所有字体都失败，使用默认字体
-        return pygame.font.Font(None, size)
-    
     def handle_event(self, event):
         """处理事件"""
         for button_name, button in self.buttons.items():
@@ -278,7 +266,7 @@ class PauseMenu:
         self.screen.blit(overlay, (0, 0))
         
         # 暂停标题
-        pause_text = self.font.render("游戏暂停", True, (255, 255, 255))
+        pause_text = render_text(self.font, "游戏暂停", (255, 255, 255))
         pause_rect = pause_text.get_rect(center=(self.screen.get_width()//2, 250))
         self.screen.blit(pause_text, pause_rect)
         
@@ -292,8 +280,8 @@ class SkinSelectionMenu:
     def __init__(self, screen, skin_manager):
         self.screen = screen
         self.skin_manager = skin_manager
-        self.font = self._get_chinese_font(36)
-        self.info_font = self._get_chinese_font(20)
+        self.font = get_chinese_font(36)
+        self.info_font = get_chinese_font(20)
         
         # 皮肤信息
         self.skins = [
@@ -303,33 +291,7 @@ class SkinSelectionMenu:
         ]
         
         self.selected_skin = 0
-    
-    def _get_chinese_font(self, size):
-        """获取支持中文的字体"""
-        # 尝试加载系统中文字体，按优先级排序
-        font_names = [
-            'Microsoft YaHei',  # 微软雅黑
-            'SimHei',           # 黑体
-            'SimSun',           # 宋体
-            'KaiTi',            # 楷体
-            'FangSong',         # 仿宋
-            'Arial Unicode MS', # Arial Unicode
-            'DejaVu Sans',      # Linux常用字体
-            'Noto Sans CJK SC'  # Google Noto字体
-        ]
-        
-        for font_name in font_names:
-            try:
-                font = pygame.font.SysFont(font_name, size)
-                # 测试字体是否支持中文
-                test_surface = font.render('测试', True, (255, 255, 255))
-                if test_surface.get_width() > 0:
-                    return font
-            except:
-                continue
-        
-        # 如果所有字体都失败，使用默认字体
-        return pygame.font.Font(None, size)
+        self._drawn_key = None
     
     def handle_event(self, event):
         """处理事件"""
@@ -367,13 +329,21 @@ class SkinSelectionMenu:
         
         return None
     
+    def collect_dirty_rects(self):
+        """选择变化时返回None（整屏重绘），否则返回空列表"""
+        key = (self.screen.get_size(), self.selected_skin, self.skin_manager.get_current_skin())
+        if key == self._drawn_key:
+            return []
+        self._drawn_key = key
+        return None
+    
     def draw(self):
         """绘制皮肤选择菜单"""
         # 背景
         self.screen.fill((26, 26, 46))
         
         # 标题
-        title_text = self.font.render("选择皮肤", True, (255, 215, 0))
+        title_text = render_text(self.font, "选择皮肤", (255, 215, 0))
         title_rect = title_text.get_rect(center=(self.screen.get_width()//2, 100))
         self.screen.blit(title_text, title_rect)
         
@@ -415,18 +385,18 @@ class SkinSelectionMenu:
             pygame.draw.rect(self.screen, (255, 255, 255), preview_rect, 2)
             
             # 皮肤名称
-            name_surface = self.info_font.render(skin["display_name"], True, (255, 255, 255))
+            name_surface = render_text(self.info_font, skin["display_name"], (255, 255, 255))
             name_rect = name_surface.get_rect(center=(card_x + card_width//2, card_y + 140))
             self.screen.blit(name_surface, name_rect)
             
             # 状态文字
             if skin["name"] == current_skin:
-                status_surface = self.info_font.render("当前使用", True, (0, 255, 0))
+                status_surface = render_text(self.info_font, "当前使用", (0, 255, 0))
                 status_rect = status_surface.get_rect(center=(card_x + card_width//2, card_y + 165))
                 self.screen.blit(status_surface, status_rect)
         
         # 操作提示
         hint_text = "使用方向键选择，回车确认，ESC返回"
-        hint_surface = self.info_font.render(hint_text, True, (200, 200, 200))
+        hint_surface = render_text(self.info_font, hint_text, (200, 200, 200))
         hint_rect = hint_surface.get_rect(center=(self.screen.get_width()//2, 500))
         self.screen.blit(hint_surface, hint_rect)
\ No newline at end of file